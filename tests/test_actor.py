@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_actor.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from basecam.events import CameraEvent
+from clu.testing import setup_test_actor
+
+from thorcam.actor import ThorActor
+from thorcam.camera import ThorCameraSystem
+from thorcam.mock import get_virtual_sdk, load_frames
+
+
+@pytest_asyncio.fixture
+async def actor(tmp_path):
+
+    frames = load_frames(shape=(20, 30), n_frames=3)
+    sdk = get_virtual_sdk(1, frames=frames, frame_rate=200)
+
+    camera_system = await ThorCameraSystem(sdk=sdk).setup()
+
+    actor = ThorActor(
+        camera_system,
+        name="thorcam",
+        host="127.0.0.1",
+        port=0,
+        data_dir=str(tmp_path),
+    )
+
+    yield await setup_test_actor(actor)
+
+    await camera_system.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_report_dropped_frames(actor):
+
+    camera = actor.camera_system.cameras[0]
+
+    actor._report_dropped_frames(CameraEvent.EXPOSURE_DONE, {"camera": camera})
+    assert len(actor.mock_replies) == 0
+
+    async for _ in camera._sdk_camera.expose_sequence_async(10, 0.001):
+        time.sleep(0.02)
+
+    actor._report_dropped_frames(CameraEvent.EXPOSURE_DONE, {"camera": camera})
+
+    reply = actor.mock_replies[-1]
+    assert reply.flag == "w"
+
+    # camera, n_frames, last_frame, dropped, duplicated, dropped_in_sequence, gaps
+    values = reply["frame_stats"].split(",")
+    assert values[0] == camera.name
+    assert int(values[5]) == camera.frame_stats.dropped_in_sequence > 0
+
+
+@pytest.mark.asyncio
+async def test_spool_command(actor):
+
+    command = await actor.invoke_mock_command("spool 0.001 5")
+
+    assert command.status.did_succeed
+
+    # camera, filename, n_frames, dropped
+    values = [reply for reply in actor.mock_replies if "spool" in reply][-1]
+    values = values["spool"].split(",")
+    assert int(values[2]) + int(values[3]) == 5
+
+
+@pytest.mark.asyncio
+async def test_abort_command(actor):
+
+    expose_command = actor.invoke_mock_command("expose 5")
+    await asyncio.sleep(0.1)
+
+    command = await actor.invoke_mock_command("abort")
+    assert command.status.did_succeed
+
+    # camera, latency
+    values = [reply for reply in actor.mock_replies if "abort" in reply][-1]
+    values = values["abort"].split(",")
+    assert values[0] == "V0001"
+    assert float(values[1]) < 0.05
+
+    await expose_command
+    assert expose_command.status.did_fail
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_badpixels.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import numpy
+
+from thorcam.badpixels import BadPixelMap
+
+
+def get_frames(n_frames=5, shape=(20, 30)):
+
+    rng = numpy.random.default_rng(42)
+    frames = rng.normal(1000, 10, size=(n_frames, *shape)).astype(numpy.uint16)
+
+    frames[:, 5, 5] = 60000
+    frames[:, 0, 0] = 60000
+    frames[:, 10, 12] = 0
+
+    return frames
+
+
+def test_from_frames():
+
+    bad_pixel_map = BadPixelMap.from_frames(get_frames())
+
+    assert bad_pixel_map.n_hot == 2
+    assert bad_pixel_map.n_dead == 1
+    assert bad_pixel_map.hot[5, 5] and bad_pixel_map.dead[10, 12]
+
+
+def test_correct():
+
+    frames = get_frames()
+    bad_pixel_map = BadPixelMap.from_frames(frames)
+
+    data = frames[0].copy()
+    corrected = bad_pixel_map.correct(data)
+
+    assert corrected is data
+    assert abs(int(data[5, 5]) - 1000) < 50
+    assert abs(int(data[0, 0]) - 1000) < 50
+    assert abs(int(data[10, 12]) - 1000) < 50
+
+
+def test_correct_adjacent_bad_pixels():
+
+    hot = numpy.zeros((5, 5), dtype=bool)
+    hot[2, 2] = hot[2, 3] = True
+
+    bad_pixel_map = BadPixelMap(hot, numpy.zeros_like(hot))
+
+    data = numpy.full((5, 5), 10, dtype=numpy.uint16)
+    data[hot] = 1000
+
+    bad_pixel_map.correct(data)
+
+    assert (data == 10).all()
+
+
+def test_save_load(tmp_path):
+
+    bad_pixel_map = BadPixelMap.from_frames(get_frames(), stride=2)
+    bad_pixel_map.save(tmp_path / "badpix.npz")
+
+    loaded = BadPixelMap.load(tmp_path / "badpix.npz")
+
+    assert loaded.stride == 2
+    assert (loaded.mask == bad_pixel_map.mask).all()
+    assert (loaded.bad_pixels == bad_pixel_map.bad_pixels).all()
+
+
+def test_stride_same_channel():
+
+    # A Bayer-like pattern where each channel of the 2x2 cell has its own level.
+    data = numpy.tile(
+        numpy.array([[100, 2000], [2000, 4000]], dtype=numpy.uint16), (5, 5)
+    )
+
+    hot = numpy.zeros(data.shape, dtype=bool)
+    hot[4, 4] = True
+
+    bad_pixel_map = BadPixelMap(hot, numpy.zeros_like(hot), stride=2)
+
+    data[4, 4] = 60000
+    bad_pixel_map.correct(data)
+
+    assert data[4, 4] == 100
+
+
+def test_from_frames_per_channel():
+
+    frames = get_frames(shape=(20, 30)).astype(numpy.float32)
+    frames[:, 1::2, 1::2] += 3000
+    frames[:, 3, 3] = 1000
+    frames = frames.astype(numpy.uint16)
+
+    bad_pixel_map = BadPixelMap.from_frames(frames, stride=2)
+
+    assert bad_pixel_map.stride == 2
+    assert bad_pixel_map.n_hot == 2
+    assert bad_pixel_map.dead[3, 3] and bad_pixel_map.dead[10, 12]
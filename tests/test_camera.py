@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_camera.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import time
+
+import astropy.time
+import numpy
+import pytest
+import pytest_asyncio
+
+from basecam.exposure import Exposure
+
+from thorcam.badpixels import BadPixelMap
+from thorcam.camera import ThorCamera, ThorCameraSystem, thorcam_header_model
+from thorcam.mock import get_virtual_sdk, load_frames
+from thorcam.spool import FrameSpool
+from thorcam.tl_camera import SENSOR_TYPE, USB_PORT_TYPE
+
+
+@pytest_asyncio.fixture
+async def camera(mocker):
+
+    sdk_camera = mocker.MagicMock()
+    sdk_camera.settings_version = 0
+    sdk_camera.sensor_type = SENSOR_TYPE.MONOCHROME
+    sdk_camera.usb_type = USB_PORT_TYPE.USB3_0
+    sdk_camera.height = 1080
+    sdk_camera.width = 1440
+    sdk_camera.exposure_time_range = (1e-5, 100.0)
+    sdk_camera.readout_time = 1000000
+    sdk_camera.filter_array_phase = None
+    sdk_camera.polar_phase = None
+    sdk_camera.frames_to_buffer = 2
+    sdk_camera.frame_rate = None
+    sdk_camera.drop_policy = None
+
+    sdk = mocker.patch("thorcam.camera.TL_SDK").return_value
+    sdk.open_camera.return_value = sdk_camera
+
+    camera = ThorCamera("12345", ThorCameraSystem(), name="test_camera")
+    await camera.connect()
+
+    yield camera
+
+
+@pytest_asyncio.fixture
+async def virtual_camera(tmp_path):
+
+    sdk = get_virtual_sdk(1, frames=load_frames(shape=(20, 30), n_frames=3))
+
+    camera = ThorCamera(
+        "V0001",
+        ThorCameraSystem(sdk=sdk),
+        name="virtual",
+        image_namer={"dirname": str(tmp_path)},
+    )
+    await camera.connect()
+
+    yield camera
+
+    await camera.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_header_template_cached(camera):
+
+    template = camera.get_header_template()
+
+    assert template["CAMUID"] == 12345
+    assert template["SENSTYPE"] == "MONOCHROME"
+    assert template["SENSWID"] == 1440
+    assert camera.get_header_template() is template
+
+    camera._sdk_camera.settings_version += 1
+    assert camera.get_header_template() is not template
+
+
+@pytest.mark.asyncio
+async def test_header_model(camera):
+
+    exposure = Exposure(camera)
+    exposure.exptime = 1.0
+    exposure.obstime = astropy.time.Time.now()
+    exposure.frame_number = 1
+    exposure.n_dropped = 0
+    exposure.dropped_frames = ""
+    exposure.bad_pixels_corrected = False
+    exposure.n_bad_pixels = 0
+
+    header = thorcam_header_model.to_header(exposure)
+
+    assert header["CAMNAME"] == "test_camera"
+    assert header["USBTYPE"] == "USB3_0"
+    assert header["FRAMENO"] == 1
+    assert "header" in camera.stage_timings
+
+
+@pytest.mark.asyncio
+async def test_status_is_flat(camera):
+
+    camera.stage_timings = {"expose": 1.0, "header": 0.0015}
+
+    status = camera.get_status(update=True)
+
+    assert status["expose_time"] == 1000.0
+    assert status["header_time"] == 1.5
+    assert not any(isinstance(value, dict) for value in status.values())
+
+
+@pytest.mark.asyncio
+async def test_reconnect_lost_camera(camera):
+
+    camera_system = camera.camera_system
+    camera_system.cameras.append(camera)
+
+    sdk = camera_system.sdk
+    sdk.open_cameras = {}
+    sdk.list_available_cameras.return_value = ["12345"]
+
+    sdk_camera = camera._sdk_camera
+    sdk_camera.acquisition_lock.locked.return_value = False
+    sdk_camera.is_responsive.return_value = False
+    sdk_camera.get_settings.return_value = {
+        "frames_to_buffer": 8,
+        "drop_policy": "enlarge_buffer",
+        "frame_rate": None,
+    }
+
+    await camera_system._check_cameras()
+
+    sdk_camera.close.assert_called()
+    sdk.list_available_cameras.assert_called_with(refresh=True)
+
+    assert camera.connected
+    assert sdk.open_camera.call_args.kwargs["frames_to_buffer"] == 8
+    assert sdk.open_camera.call_args.kwargs["drop_policy"] == "enlarge_buffer"
+
+
+@pytest.mark.asyncio
+async def test_capture_to_spool_same_second(virtual_camera):
+
+    path1, _ = await virtual_camera.capture_to_spool(0.001, 2)
+    path2, n_written = await virtual_camera.capture_to_spool(0.001, 2)
+
+    assert path1 != path2
+    assert n_written == 2
+
+    with FrameSpool(path2) as spool:
+        assert len(spool) == 2
+
+
+@pytest.mark.asyncio
+async def test_bad_pixels_not_written_to_sdk_buffer(virtual_camera):
+
+    libc_camera = virtual_camera.camera_system.sdk.libc.cameras["V0001"]
+    libc_camera.frames[:, 5, 5] = 60000
+
+    hot = numpy.zeros((20, 30), dtype=bool)
+    hot[5, 5] = True
+    virtual_camera.bad_pixel_map = BadPixelMap(hot, numpy.zeros_like(hot))
+
+    exposure = await virtual_camera.expose(0.001)
+
+    assert exposure.bad_pixels_corrected
+    assert exposure.data[5, 5] < 60000
+    assert libc_camera._buffer[0, 5, 5] == 60000
+
+
+@pytest.mark.asyncio
+async def test_stack_distinct_frames(virtual_camera):
+
+    libc_camera = virtual_camera.camera_system.sdk.libc.cameras["V0001"]
+    libc_camera.frames[:] = numpy.array([10, 20, 30])[:, None, None]
+
+    exposure = await virtual_camera.expose(0.001, stack=3, stack_function=numpy.mean)
+
+    assert numpy.all(exposure.data == 20)
+
+
+@pytest.mark.asyncio
+async def test_capture_to_spool_many_dropped(virtual_camera, mocker):
+
+    append = FrameSpool.append
+
+    def slow_append(*args, **kwargs):
+        time.sleep(0.01)
+        return append(*args, **kwargs)
+
+    mocker.patch.object(FrameSpool, "append", slow_append)
+
+    path, n_written = await virtual_camera.capture_to_spool(0.001, 300)
+
+    frame_stats = virtual_camera.frame_stats
+    assert frame_stats.dropped_in_sequence > 100
+    assert n_written + frame_stats.dropped_in_sequence == 300
+
+    with FrameSpool(path) as spool:
+        assert len(spool) == n_written
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_loadtest.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import asyncio
+import socket
+
+import pytest
+
+from thorcam.loadtest import ActorClient, run_load_test
+from thorcam.mock import load_frames
+
+
+def get_free_port():
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_load_test():
+
+    result = await run_load_test(
+        2,
+        duration=1.0,
+        frames=load_frames(shape=(20, 30)),
+        status_interval=0.2,
+        abort_interval=0.3,
+        port=get_free_port(),
+    )
+
+    summary = result.summary()
+
+    assert summary["n_cameras"] == 2
+    assert summary["expose_n"] > 0
+    assert summary["status_failed"] == 0
+    assert result.n_files > 0
+    assert len(result.loop_lag) > 0
+
+
+@pytest.mark.asyncio
+async def test_client_timeout():
+
+    async def no_reply(reader, writer):
+        await reader.read()
+
+    server = await asyncio.start_server(no_reply, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    client = await ActorClient("127.0.0.1", port, timeout=0.1).start()
+
+    success, latency = await client.send("status")
+
+    assert not success
+    assert latency >= 0.1
+    assert client._pending == {}
+
+    await client.stop()
+
+    server.close()
+    await server.wait_closed()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_mock.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import asyncio
+import time
+
+import numpy
+import pytest
+
+from thorcam.exceptions import AbortedError, SDKError
+from thorcam.mock import get_virtual_sdk, load_frames
+from thorcam.tl_camera import MAX_FRAMES_TO_BUFFER
+
+
+@pytest.fixture
+def frames():
+
+    yield load_frames(shape=(20, 30), n_frames=3)
+
+
+@pytest.mark.asyncio
+async def test_virtual_expose(frames):
+
+    sdk = get_virtual_sdk(2, frames=frames)
+    assert sdk.list_available_cameras() == ["V0001", "V0002"]
+
+    sdk_camera = sdk.open_camera("V0001")
+
+    data = await sdk_camera.expose_async(0.001)
+
+    assert data.shape == (20, 30)
+    numpy.testing.assert_array_equal(data, frames[0])
+
+
+@pytest.mark.asyncio
+async def test_virtual_dropped_frames(frames):
+
+    sdk = get_virtual_sdk(1, frames=frames, frame_rate=200)
+    sdk_camera = sdk.open_camera("V0001", frames_to_buffer=2)
+
+    n_frames = 0
+    async for _ in sdk_camera.expose_sequence_async(10, 0.001):
+        n_frames += 1
+        if n_frames == 2:
+            time.sleep(0.05)
+
+    assert n_frames < 10
+    assert sdk_camera.frame_stats.dropped == 10 - n_frames
+
+
+async def drop_frames(sdk_camera):
+    """Runs a sequence reading the frames slower than the camera produces them."""
+
+    async for _ in sdk_camera.expose_sequence_async(10, 0.001):
+        time.sleep(0.02)
+
+    assert sdk_camera.frame_stats.dropped > 0
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_enlarge_buffer(frames):
+
+    sdk = get_virtual_sdk(1, frames=frames, frame_rate=200)
+    sdk_camera = sdk.open_camera(
+        "V0001",
+        frames_to_buffer=2,
+        drop_policy="enlarge_buffer",
+    )
+
+    await drop_frames(sdk_camera)
+    assert sdk_camera.frames_to_buffer > 2
+
+    for _ in range(10):
+        sdk_camera._apply_drop_policy()
+    assert sdk_camera.frames_to_buffer == MAX_FRAMES_TO_BUFFER
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_reduce_frame_rate(frames):
+
+    sdk = get_virtual_sdk(1, frames=frames, frame_rate=200)
+    sdk_camera = sdk.open_camera(
+        "V0001",
+        frames_to_buffer=2,
+        drop_policy="reduce_frame_rate",
+    )
+
+    await drop_frames(sdk_camera)
+    assert sdk_camera.frame_rate < 200
+
+    sdk_camera.frame_rate = 1.0
+    sdk_camera._apply_drop_policy()
+    assert sdk_camera.frame_rate == sdk_camera.frame_rate_range[0]
+
+
+def test_invalid_drop_policy(frames):
+
+    sdk = get_virtual_sdk(1, frames=frames)
+
+    with pytest.raises(SDKError):
+        sdk.open_camera("V0001", drop_policy="bad_policy")
+
+
+def test_virtual_discover_once():
+
+    sdk = get_virtual_sdk(1)
+
+    with pytest.raises(SDKError):
+        sdk.libc.tl_camera_discover_available_cameras(None, 100)
+
+    sdk.libc.cameras["V0001"].plugged = False
+    assert sdk.list_available_cameras(refresh=True) == []
+
+
+def test_close_camera_after_sdk(frames):
+
+    sdk = get_virtual_sdk(1, frames=frames)
+    sdk_camera = sdk.open_camera("V0001")
+
+    sdk.close()
+    sdk_camera.close()
+
+    assert sdk_camera.closed
+
+
+@pytest.mark.asyncio
+async def test_cancel_unplugged_camera(frames):
+
+    sdk = get_virtual_sdk(1, frames=frames)
+    sdk_camera = sdk.open_camera("V0001")
+
+    task = asyncio.create_task(sdk_camera.expose_async(5))
+    await asyncio.sleep(0.1)
+
+    sdk.libc.cameras["V0001"].plugged = False
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_abort_unplugged_camera(frames):
+
+    sdk = get_virtual_sdk(1, frames=frames)
+    sdk_camera = sdk.open_camera("V0001")
+
+    task = asyncio.create_task(sdk_camera.expose_async(5))
+    await asyncio.sleep(0.1)
+
+    sdk.libc.cameras["V0001"].plugged = False
+    await sdk_camera.abort()
+
+    with pytest.raises(AbortedError):
+        await task
+
+
+def test_reopen_after_failure(frames, mocker):
+
+    sdk = get_virtual_sdk(1, frames=frames)
+
+    open_sdk = sdk.libc.open_sdk
+    mocker.patch.object(sdk.libc, "open_sdk", side_effect=SDKError("USB error."))
+
+    with pytest.raises(SDKError):
+        sdk.list_available_cameras(refresh=True)
+    assert not sdk.is_sdk_open
+
+    sdk.libc.open_sdk = open_sdk
+
+    assert sdk.list_available_cameras(refresh=True) == ["V0001"]
+    assert sdk.is_sdk_open
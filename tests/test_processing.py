@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_processing.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import numpy
+import pytest
+
+from thorcam.processing import (
+    POLARIZER_TILE,
+    demosaic_bilinear,
+    get_polarization_channels,
+    get_polarization_products,
+)
+
+
+@pytest.mark.parametrize("pattern", ["RGGB", "BGGR", "GRBG", "GBRG"])
+def test_demosaic_bilinear(pattern):
+
+    values = {"R": 100, "G": 50, "B": 10}
+
+    raw = numpy.zeros((8, 10), dtype=numpy.uint16)
+    for ii, colour in enumerate(pattern):
+        row, col = divmod(ii, 2)
+        raw[row::2, col::2] = values[colour]
+
+    rgb = demosaic_bilinear(raw, pattern)
+
+    assert rgb.shape == (3, 8, 10)
+    numpy.testing.assert_allclose(rgb[0], 100)
+    numpy.testing.assert_allclose(rgb[1], 50)
+    numpy.testing.assert_allclose(rgb[2], 10)
+
+
+def get_polarized_image(intensity, angle, dolp=1.0, shape=(8, 10)):
+
+    raw = numpy.zeros(shape, dtype=numpy.float32)
+    for (row, col), polarizer in numpy.ndenumerate(POLARIZER_TILE):
+        cos = numpy.cos(numpy.radians(2 * (polarizer - angle)))
+        raw[row::2, col::2] = 0.5 * intensity * (1 + dolp * cos)
+
+    return raw
+
+
+def test_polarization_channels():
+
+    raw = get_polarized_image(1000, 0)
+    channels = get_polarization_channels(raw, top_left_angle=90)
+
+    assert channels[0].shape == (4, 5)
+    assert numpy.shares_memory(channels[0], raw)
+    numpy.testing.assert_allclose(channels[0], 1000)
+    numpy.testing.assert_allclose(channels[90], 0, atol=1e-3)
+
+
+def test_polarization_channels_phase():
+
+    raw = get_polarized_image(1000, 0)[1:, 1:]
+    channels = get_polarization_channels(raw, top_left_angle=0)
+
+    numpy.testing.assert_allclose(channels[0], 1000)
+
+
+def test_polarization_products():
+
+    raw = get_polarized_image(1000, 30, dolp=0.5)
+    products = get_polarization_products(raw, top_left_angle=90)
+
+    numpy.testing.assert_allclose(products["S0"], 1000, rtol=1e-5)
+    numpy.testing.assert_allclose(products["DOLP"], 0.5, rtol=1e-5)
+    numpy.testing.assert_allclose(products["AOLP"], 30, rtol=1e-5)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_spool.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import numpy
+import pytest
+from astropy.io import fits
+
+from thorcam.spool import FrameSpool, spool_to_fits
+
+
+@pytest.fixture
+def spool_path(tmp_path):
+
+    path = tmp_path / "test.spool"
+
+    with FrameSpool.create(path, 5, 8, 10, uid="13981") as spool:
+        for ii in range(3):
+            data = numpy.full((8, 10), ii, dtype=numpy.uint16)
+            spool.append(data, frame_count=ii + 1, timestamp=1.6e9 + ii, exptime=0.1)
+
+    yield path
+
+
+def test_spool(spool_path):
+
+    with FrameSpool(spool_path) as spool:
+        assert len(spool) == 3
+        assert spool.uid == "13981"
+        assert spool.valid_slots().tolist() == [0, 1, 2]
+        assert spool.frames[2].mean() == 2
+        assert spool.metadata["frame_count"][1] == 2
+
+
+def test_spool_full(tmp_path):
+
+    spool = FrameSpool.create(tmp_path / "full.spool", 1, 4, 4)
+    spool.append(numpy.zeros((4, 4), dtype=numpy.uint16))
+
+    assert spool.full
+
+    with pytest.raises(ValueError):
+        spool.append(numpy.zeros((4, 4), dtype=numpy.uint16))
+
+
+def test_spool_close_twice(spool_path):
+
+    spool = FrameSpool(spool_path)
+    spool.close()
+    spool.close()
+
+    assert spool.closed
+
+
+def test_spool_exists(spool_path):
+
+    with pytest.raises(FileExistsError):
+        FrameSpool.create(spool_path, 5, 8, 10)
+
+
+def test_spool_to_fits(spool_path):
+
+    files = spool_to_fits(spool_path)
+
+    assert len(files) == 3
+    assert fits.getheader(files[1])["FRAMENO"] == 2
+
+
+def test_spool_to_fits_cube(spool_path):
+
+    files = spool_to_fits(spool_path, cube=True)
+
+    hdus = fits.open(files[0])
+    assert hdus[0].data.shape == (3, 8, 10)
+    assert hdus["FRAMES"].data["FRAMENO"].tolist() == [1, 2, 3]
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: test_tl_camera.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+import asyncio
+
+import pytest
+
+from thorcam.exceptions import AbortedError, SDKError
+from thorcam.mock import get_virtual_sdk, load_frames
+from thorcam.tl_camera import DISCOVERY_BUFFER_SIZE, TL_SDK, FrameStats
+
+
+@pytest.fixture
+def sdk_camera():
+
+    sdk = get_virtual_sdk(1, frames=load_frames(shape=(20, 30), n_frames=3))
+
+    yield sdk.open_camera("V0001")
+
+
+def test_frame_stats_gaps():
+
+    frame_stats = FrameStats()
+
+    assert frame_stats.update(1) == []
+    assert frame_stats.update(4) == [2, 3]
+    assert frame_stats.update(5) == []
+
+    assert frame_stats.n_frames == 3
+    assert frame_stats.dropped == 2
+    assert frame_stats.gaps == [2, 3]
+
+
+def test_frame_stats_duplicated():
+
+    frame_stats = FrameStats()
+
+    frame_stats.update(1)
+    frame_stats.update(1)
+
+    assert frame_stats.duplicated == 1
+    assert frame_stats.dropped == 0
+
+
+def test_frame_stats_new_sequence():
+
+    frame_stats = FrameStats()
+
+    frame_stats.update(1)
+    frame_stats.update(3)
+
+    frame_stats.start_sequence()
+    frame_stats.update(1)
+
+    assert frame_stats.gaps == []
+    assert frame_stats.dropped == 1
+    assert frame_stats.duplicated == 0
+
+
+def test_frame_stats_many_dropped():
+
+    frame_stats = FrameStats(max_gaps=100)
+
+    frame_stats.update(1)
+    frame_stats.update(252)
+
+    assert frame_stats.dropped_in_sequence == 250
+    assert len(frame_stats.gaps) == 100
+    assert frame_stats.gaps[-1] == 251
+
+    frame_stats.start_sequence()
+    assert frame_stats.dropped_in_sequence == 0
+    assert frame_stats.dropped == 250
+
+
+def test_sdk_reopen(mocker):
+
+    libc = mocker.patch("ctypes.cdll.LoadLibrary").return_value
+    libc.tl_camera_discover_available_cameras.side_effect = (
+        lambda buffer, size: setattr(buffer, "value", b"12345 67890")
+    )
+
+    sdk = TL_SDK()
+    assert sdk.list_available_cameras() == ["12345", "67890"]
+
+    discover = libc.tl_camera_discover_available_cameras
+    assert discover.call_args[0][1] == DISCOVERY_BUFFER_SIZE
+
+    sdk_camera = mocker.MagicMock()
+    sdk.open_cameras["12345"] = sdk_camera
+
+    with pytest.raises(SDKError):
+        sdk.list_available_cameras(refresh=True)
+
+    del sdk.open_cameras["12345"]
+
+    sdk.list_available_cameras(refresh=True)
+
+    assert libc.tl_camera_close_sdk.call_count == 1
+    assert libc.tl_camera_open_sdk.call_count == 2
+    assert discover.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_abort(sdk_camera):
+
+    task = asyncio.create_task(sdk_camera.expose_async(5))
+    await asyncio.sleep(0.1)
+
+    latency = await sdk_camera.abort()
+
+    with pytest.raises(AbortedError):
+        await task
+
+    assert latency < 0.05
+    assert not sdk_camera.is_armed()
+
+
+@pytest.mark.asyncio
+async def test_abort_idle(sdk_camera):
+
+    latency = await sdk_camera.abort()
+
+    assert latency < 0.05
+    assert not sdk_camera.is_armed()
+
+
+@pytest.mark.asyncio
+async def test_cancel_exposure(sdk_camera):
+
+    task = asyncio.create_task(sdk_camera.expose_async(5))
+    await asyncio.sleep(0.1)
+
+    assert sdk_camera.is_armed()
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert not sdk_camera.is_armed()
+    assert not sdk_camera.acquisition_lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_acquisition_lock(sdk_camera):
+
+    finished = []
+
+    async def expose(name: str, exposure_time: float):
+        await sdk_camera.expose_async(exposure_time)
+        finished.append(name)
+
+    first = asyncio.create_task(expose("first", 0.2))
+    await asyncio.sleep(0.05)
+
+    # The second exposure is shorter but must wait for the first one.
+    second = asyncio.create_task(expose("second", 0.001))
+    await asyncio.sleep(0.05)
+
+    assert sdk_camera.acquisition_lock.locked()
+    assert finished == []
+
+    await asyncio.gather(first, second)
+
+    assert finished == ["first", "second"]
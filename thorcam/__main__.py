@@ -8,6 +8,7 @@
 
 from __future__ import annotations
 
+import json
 import os
 
 import click
@@ -18,6 +19,7 @@ from sdsstools.daemonizer import DaemonGroup, cli_coro
 from thorcam import config
 from thorcam.actor import ThorActor
 from thorcam.camera import ThorCameraSystem
+from thorcam.spool import spool_to_fits
 
 
 @click.group(cls=DefaultGroup, default="actor", default_if_no_args=True)
@@ -34,10 +36,128 @@ async def actor():
 
     thorcam = await ThorCameraSystem().setup()
 
+    poller_config = config.get("camera_poller", {})
+    if poller_config.get("enabled", False):
+        await thorcam.start_camera_poller(interval=poller_config["interval"])
+
     thor_actor = await ThorActor.from_config(config["actor"], thorcam).start()
     await thor_actor.run_forever()
 
 
+@thorcam.command(name="spool-to-fits")
+@click.argument("SPOOL", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(),
+    help="Output file for a cube, or output directory.",
+)
+@click.option("--cube", is_flag=True, help="Writes a single FITS cube.")
+@click.option("--overwrite", is_flag=True, help="Overwrites existing files.")
+def spool_to_fits_(spool: str, output: str | None, cube: bool, overwrite: bool):
+    """Converts a spool file to FITS."""
+
+    files = spool_to_fits(spool, output=output, cube=cube, overwrite=overwrite)
+    click.echo(f"Wrote {len(files)} FITS files.")
+
+
+@thorcam.command(name="load-test")
+@click.option(
+    "-n",
+    "--cameras",
+    "camera_counts",
+    type=int,
+    multiple=True,
+    default=(1, 2, 4, 8),
+    show_default=True,
+    help="Number of virtual cameras. Can be repeated.",
+)
+@click.option(
+    "-d",
+    "--duration",
+    type=float,
+    default=30.0,
+    show_default=True,
+    help="Duration of each run, in seconds.",
+)
+@click.option(
+    "-t",
+    "--exptime",
+    type=float,
+    default=0.01,
+    show_default=True,
+    help="Exposure time, in seconds.",
+)
+@click.option(
+    "--frames",
+    "frame_files",
+    type=click.Path(exists=True, dir_okay=False),
+    multiple=True,
+    help="FITS or spool file with frames to replay. Can be repeated.",
+)
+@click.option("--frame-rate", type=float, help="Frame rate of the virtual cameras.")
+@click.option(
+    "--status-interval",
+    type=float,
+    default=0.5,
+    show_default=True,
+    help="Interval between status commands, in seconds.",
+)
+@click.option("--abort-interval", type=float, help="Interval between aborts.")
+@click.option(
+    "--port",
+    type=int,
+    default=config["load_test"]["port"],
+    show_default=True,
+    help="Port for the actor.",
+)
+@click.option(
+    "--command-timeout",
+    type=float,
+    default=config["load_test"]["command_timeout"],
+    show_default=True,
+    help="Time after which a command without a reply is counted as failed.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="Writes the results to a JSON file.",
+)
+@cli_coro()
+async def load_test(
+    camera_counts: tuple[int, ...],
+    frame_files: tuple[str, ...],
+    output: str | None,
+    **kwargs,
+):
+    """Runs the actor with virtual cameras and reports how it scales."""
+
+    # Imported here to avoid loading the load test machinery for other commands.
+    from thorcam.loadtest import run_load_test_sweep
+    from thorcam.mock import load_frames
+
+    results = await run_load_test_sweep(
+        camera_counts,
+        frames=load_frames(frame_files),
+        **kwargs,
+    )
+
+    summaries = [result.summary() for result in results]
+
+    metrics = []
+    for summary in summaries:
+        metrics += [metric for metric in summary if metric not in metrics]
+
+    for metric in metrics:
+        values = "".join(f"{summary.get(metric, '-'):>12}" for summary in summaries)
+        click.echo(f"{metric:<20}{values}")
+
+    if output:
+        with open(output, "w") as fd:
+            json.dump(summaries, fd, indent=2)
+
+
 def main():
     thorcam(obj={}, auto_envvar_prefix="thorcam")
 
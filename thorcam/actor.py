@@ -6,12 +6,30 @@
 # @Filename: actor.py
 # @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
 
+import json
+import os
+
 from typing import Optional
 
 from basecam.actor import BaseCameraActor
+from basecam.actor.tools import get_schema
+from basecam.events import CameraEvent
 from clu.legacy import LegacyActor
 
-from thorcam.camera import ThorCameraSystem
+from thorcam.camera import ThorCamera, ThorCameraSystem
+from thorcam.commands import THORCAM_COMMANDS
+
+
+def get_thorcam_schema() -> dict:
+    """Returns the ``basecam`` schema extended with the ``thorcam`` keywords."""
+
+    schema = get_schema()
+
+    schema_file = os.path.join(os.path.dirname(__file__), "etc/schema.json")
+    with open(schema_file) as fd:
+        schema["properties"].update(json.load(fd))
+
+    return schema
 
 
 class ThorActor(BaseCameraActor, LegacyActor):
@@ -27,8 +45,15 @@ class ThorActor(BaseCameraActor, LegacyActor):
     ):
 
         self.camera_system = camera_system
+
+        kwargs["schema"] = kwargs.get("schema", None) or get_thorcam_schema()
         super().__init__(camera_system, *args, **kwargs)
 
+        for command in THORCAM_COMMANDS:
+            self.parser.add_command(command)
+
+        self.listener.register_callback(self._report_dropped_frames)
+
         # The default image namer writes to ./ For production we want to write to /data.
         _data_dir: str = data_dir or "/data/tcam"
         _image_name: str = image_name or "thorcam-{num:04d}.fits"
@@ -48,3 +73,19 @@ class ThorActor(BaseCameraActor, LegacyActor):
             camera.image_namer.dirname = _data_dir
             camera.image_namer.camera = camera
             camera.fits_model.context.update({"__actor__": self})
+
+    def _report_dropped_frames(self, event: CameraEvent, payload: dict):
+        """Outputs the frame counters if frames were dropped during an exposure."""
+
+        if event != CameraEvent.EXPOSURE_DONE:
+            return
+
+        camera = payload.get("camera", None)
+        if not isinstance(camera, ThorCamera):
+            return
+
+        if camera.frame_stats.dropped_in_sequence == 0:
+            return
+
+        frame_stats = {"camera": camera.name, **camera.frame_stats.to_dict()}
+        self.write("w", frame_stats=frame_stats)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: badpixels.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import pathlib
+
+from typing import Sequence, Union
+
+import numpy
+
+
+__all__ = ["BadPixelMap"]
+
+
+PathLike = Union[str, pathlib.Path]
+
+#: Scale factor between the median absolute deviation and the standard deviation.
+MAD_TO_SIGMA = 1.4826
+
+
+class BadPixelMap:
+    """A map of hot and dead pixels and their precomputed correction.
+
+    On initialisation, the flat indices of the bad pixels and of their good
+    neighbours are computed once so that `.correct` only needs a few vectorised
+    operations per frame.
+
+    Parameters
+    ----------
+    hot
+        A boolean array with the hot pixels.
+    dead
+        A boolean array with the dead pixels. Must have the same shape as ``hot``.
+    stride
+        The distance between neighbouring pixels of the same channel. Use 1 for
+        monochrome sensors and 2 for sensors with a 2x2 filter pattern (Bayer or
+        polarised), so that bad pixels are only replaced with pixels of their own
+        channel.
+
+    """
+
+    def __init__(self, hot: numpy.ndarray, dead: numpy.ndarray, stride: int = 1):
+
+        if hot.shape != dead.shape:
+            raise ValueError("hot and dead masks have different shapes.")
+
+        if stride < 1:
+            raise ValueError("stride must be a positive integer.")
+
+        self.hot = hot.astype(bool)
+        self.dead = dead.astype(bool)
+        self.mask = self.hot | self.dead
+
+        self.stride = int(stride)
+
+        self.shape = self.mask.shape
+
+        self._compute_indices()
+
+    def __repr__(self):
+        return (
+            f"<BadPixelMap (n_hot={self.n_hot}, n_dead={self.n_dead}, "
+            f"stride={self.stride})>"
+        )
+
+    @property
+    def n_hot(self) -> int:
+        """Number of hot pixels."""
+
+        return int(self.hot.sum())
+
+    @property
+    def n_dead(self) -> int:
+        """Number of dead pixels."""
+
+        return int(self.dead.sum())
+
+    def _compute_indices(self):
+        """Computes the indices of the bad pixels and their good neighbours."""
+
+        height, width = self.shape
+        mask = self.mask.ravel()
+
+        bad = numpy.flatnonzero(mask)
+        rows, cols = numpy.divmod(bad, width)
+
+        drows, dcols = numpy.mgrid[-1:2, -1:2].reshape(2, -1) * self.stride
+        centre = (drows == 0) & (dcols == 0)
+        drows = drows[~centre]
+        dcols = dcols[~centre]
+
+        nrows = rows[:, None] + drows[None, :]
+        ncols = cols[:, None] + dcols[None, :]
+
+        inside = (nrows >= 0) & (nrows < height) & (ncols >= 0) & (ncols < width)
+        neighbours = numpy.where(inside, nrows * width + ncols, 0)
+        valid = inside & ~mask[neighbours]
+
+        # Pixels without good neighbours cannot be corrected.
+        correctable = valid.any(axis=1)
+
+        #: Flat indices of the bad pixels that can be corrected.
+        self.bad_pixels = bad[correctable]
+
+        #: Flat indices of the 8 same-channel neighbours of each bad pixel.
+        self.neighbours = neighbours[correctable]
+
+        #: Whether each neighbour is inside the frame and is a good pixel.
+        self.valid_neighbours = valid[correctable]
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Union[numpy.ndarray, Sequence[numpy.ndarray]],
+        n_sigma: float = 5.0,
+        stride: int = 1,
+    ) -> BadPixelMap:
+        """Builds a bad pixel map from a stack of frames.
+
+        The median of the stack is compared with its overall median level. Pixels
+        more than ``n_sigma`` times the robust standard deviation (estimated from
+        the median absolute deviation) above the level are flagged as hot; those
+        below it are flagged as dead. Dark frames are suitable to find hot pixels,
+        but dead pixels can only be found with illuminated frames.
+
+        With ``stride > 1`` the level and the standard deviation are computed
+        independently for each channel of the ``stride x stride`` filter pattern,
+        since the channels of a Bayer or polarised sensor have different responses.
+
+        """
+
+        stack = numpy.asarray(frames, dtype=numpy.float32)
+        if stack.ndim == 2:
+            stack = stack[None, :, :]
+
+        median_frame = numpy.median(stack, axis=0)
+
+        hot = numpy.zeros(median_frame.shape, dtype=bool)
+        dead = numpy.zeros(median_frame.shape, dtype=bool)
+
+        for row in range(stride):
+            for col in range(stride):
+
+                channel = median_frame[row::stride, col::stride]
+
+                level = numpy.median(channel)
+                sigma = MAD_TO_SIGMA * numpy.median(numpy.abs(channel - level))
+
+                # Avoid flagging every pixel in very uniform frames, since the data
+                # are quantised to ADUs.
+                sigma = max(float(sigma), 1.0)
+
+                hot[row::stride, col::stride] = channel > level + n_sigma * sigma
+                dead[row::stride, col::stride] = channel < level - n_sigma * sigma
+
+        return cls(hot, dead, stride=stride)
+
+    @classmethod
+    def load(cls, path: PathLike) -> BadPixelMap:
+        """Loads a bad pixel map saved with `.save`."""
+
+        with numpy.load(path) as data:
+            # Maps saved before the stride was added are for monochrome sensors.
+            stride = int(data["stride"]) if "stride" in data.files else 1
+            return cls(data["hot"], data["dead"], stride=stride)
+
+    def save(self, path: PathLike):
+        """Saves the bad pixel map as a compressed ``.npz`` file."""
+
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        numpy.savez_compressed(
+            path,
+            hot=self.hot,
+            dead=self.dead,
+            stride=self.stride,
+        )
+
+    def correct(self, data: numpy.ndarray) -> numpy.ndarray:
+        """Replaces the bad pixels with the median of their good neighbours.
+
+        Only neighbours of the same channel, ``stride`` pixels away, are used.
+
+        The correction is applied in place and the same array is returned.
+
+        """
+
+        if data.shape != self.shape:
+            raise ValueError(f"Data shape {data.shape} does not match the map.")
+
+        if len(self.bad_pixels) == 0:
+            return data
+
+        values = data.reshape(-1)[self.neighbours].astype(numpy.float32)
+        values[~self.valid_neighbours] = numpy.nan
+
+        medians = numpy.nanmedian(values, axis=1)
+
+        if numpy.issubdtype(data.dtype, numpy.integer):
+            medians = numpy.round(medians)
+
+        data.flat[self.bad_pixels] = medians
+
+        return data
@@ -8,23 +8,164 @@
 
 from __future__ import annotations
 
-from typing import Type
+import asyncio
+import itertools
+import logging
+import os
+import pathlib
+import time
+from functools import partial
+
+from typing import Any, Dict, Optional, Tuple, Type
 
 import astropy.time
+import numpy
+from astropy.io.fits import Header, ImageHDU
 
 from basecam.camera import BaseCamera, CameraEvent, CameraSystem
 from basecam.exceptions import CameraConnectionError, ExposureError
 from basecam.exposure import Exposure
+from basecam.models import Card, Extension, FITSModel, HeaderModel, MacroCard
+from basecam.models.builtin import basic_header_model
 
 from thorcam import __version__ as thorcam_version
-from thorcam.tl_camera import TL_SDK
+from thorcam import config
+from thorcam.badpixels import BadPixelMap
+from thorcam.exceptions import SDKError
+from thorcam.processing import (
+    BAYER_PATTERNS,
+    POLAR_ANGLES,
+    demosaic_bilinear,
+    get_polarization_products,
+)
+from thorcam.spool import FrameSpool
+from thorcam.tl_camera import SENSOR_TYPE, TL_SDK, FrameStats
+
+
+def format_frame_gaps(gaps: list[int], max_length: int = 68) -> str:
+    """Formats a list of missing frame counters as a string for a header card."""
+
+    value = ",".join(map(str, gaps))
+    if len(value) > max_length:
+        value = value[: max_length - 3].rsplit(",", 1)[0] + "..."
+
+    return value
+
+
+#: Default cards that do not change while the camera is connected. They are
+#: evaluated once and included in the camera header template.
+STATIC_DEFAULT_CARDS = ["VCAM", "BASECAMV", "CAMNAME", "CAMUID"]
+
+
+class CameraHeaderTemplate(MacroCard):
+    """Adds the cached header template of the camera that took the exposure.
+
+    The template contains the cards that do not change while the camera is
+    connected. See `.ThorCamera.get_header_template`.
+
+    """
+
+    name = "Camera information"
+
+    def macro(self, exposure: Exposure, context: Dict[str, Any] = {}):
+        return list(self.to_header(exposure, context=context).cards)
+
+    def to_header(
+        self,
+        exposure: Exposure,
+        context: Dict[str, Any] = {},
+        use_group_title: bool = False,
+    ) -> Header:
+
+        camera = exposure.camera
+        if not isinstance(camera, ThorCamera):
+            return Header()
+
+        return camera.get_header_template().copy()
+
+
+class ThorHeaderModel(HeaderModel):
+    """A header model that records the time it takes to build the header.
+
+    The time is stored in the ``header`` stage of `.ThorCamera.stage_timings`.
+
+    """
+
+    def to_header(self, exposure: Exposure, context: Dict[str, Any] = {}) -> Header:
+
+        start = time.perf_counter()
+        header = super().to_header(exposure, context=context)
+
+        camera = exposure.camera
+        if isinstance(camera, ThorCamera):
+            camera.stage_timings["header"] = time.perf_counter() - start
+
+        return header
+
+
+thorcam_header_model = ThorHeaderModel(
+    [CameraHeaderTemplate()]
+    + [card for card in basic_header_model if card.name not in STATIC_DEFAULT_CARDS]
+    + [
+        Card(
+            "FRAMENO",
+            value="{__exposure__.frame_number}",
+            comment="SDK frame counter in the sequence",
+            type=int,
+        ),
+        Card(
+            "NDROPPED",
+            value="{__exposure__.n_dropped}",
+            comment="Frames dropped in the sequence",
+            type=int,
+        ),
+        Card(
+            "DROPSEQ",
+            value="{__exposure__.dropped_frames}",
+            comment="Counters of the dropped frames",
+            type=str,
+        ),
+        Card(
+            "BADPIXCR",
+            value="{__exposure__.bad_pixels_corrected}",
+            comment="Bad pixels replaced by the neighbour median?",
+        ),
+        Card(
+            "NBADPIX",
+            value="{__exposure__.n_bad_pixels}",
+            comment="Number of bad pixels corrected",
+            type=int,
+        ),
+    ]
+)
+
+thorcam_fits_model = FITSModel(
+    [Extension(data="raw", header_model=thorcam_header_model, name="PRIMARY")]
+)
 
 
 class ThorCamera(BaseCamera):
     """Thorlabs camera."""
 
+    fits_model = thorcam_fits_model
+
+    bad_pixel_map: Optional[BadPixelMap] = None
+
+    #: Duration, in seconds, of each stage of the last exposure.
+    stage_timings: Dict[str, float]
+
+    _header_template: Optional[tuple[int, Header]] = None
+
+    #: SDK settings to restore when the camera reconnects after being lost.
+    _cached_settings: Optional[Dict[str, Any]] = None
+
     async def _connect_internal(self, **conn_params):
-        """Internal method to connect the camera."""
+        """Internal method to connect the camera.
+
+        If the camera was lost (see `.handle_connection_lost`), the settings it had
+        are restored.
+
+        """
 
         serial = self.uid
 
@@ -32,11 +173,91 @@ class ThorCamera(BaseCamera):
             raise CameraConnectionError("Unknown serial number.")
 
         assert isinstance(self.camera_system, ThorCameraSystem)
-        self._sdk_camera = self.camera_system.sdk.open_camera(serial)
+
+        sdk_params = {
+            param: self.camera_params[param]
+            for param in ["frames_to_buffer", "drop_policy"]
+            if param in self.camera_params
+        }
+
+        cached_settings = (self._cached_settings or {}).copy()
+        frame_rate = cached_settings.pop("frame_rate", None)
+        sdk_params.update(cached_settings)
+
+        try:
+            self._sdk_camera = self.camera_system.sdk.open_camera(serial, **sdk_params)
+        except SDKError as err:
+            raise CameraConnectionError(str(err))
 
         if self._sdk_camera is None:
             raise CameraConnectionError(f"Cannot find camera with serial {serial}.")
 
+        if frame_rate is not None:
+            try:
+                self._sdk_camera.frame_rate = frame_rate
+            except SDKError as err:
+                self.log(f"cannot restore the frame rate: {err}", logging.WARNING)
+
+        self._cached_settings = None
+
+        self.stage_timings = {}
+
+        self._load_bad_pixel_map()
+        self.invalidate_header_template()
+
+    async def _disconnect_internal(self):
+        """Closes the camera."""
+
+        if self.connected:
+            try:
+                self._sdk_camera.close()
+            except SDKError as err:
+                raise CameraConnectionError(str(err))
+
+        self.connected = False
+
+    def is_responsive(self) -> bool:
+        """Checks whether the camera still responds.
+
+        Returns `True` without querying the camera while an acquisition is running,
+        since a lost camera will make the acquisition fail.
+
+        """
+
+        if not self.connected:
+            return False
+
+        if self._sdk_camera.acquisition_lock.locked():
+            return True
+
+        return self._sdk_camera.is_responsive()
+
+    def handle_connection_lost(self):
+        """Closes a camera that stopped responding and caches its settings.
+
+        The camera is marked as disconnected. The cached settings are restored the
+        next time the camera connects.
+
+        """
+
+        self._cached_settings = self._sdk_camera.get_settings()
+
+        try:
+            self._sdk_camera.close()
+        except SDKError:
+            pass
+
+        self.connected = False
+
+        self.log("camera stopped responding.", logging.WARNING)
+        self.notify(CameraEvent.CAMERA_DISCONNECTED)
+
+    @property
+    def frame_stats(self) -> FrameStats:
+        """The frame counter statistics for the camera."""
+
+        return self._sdk_camera.frame_stats
+
     async def _expose_internal(self, exposure: Exposure, **kwargs) -> Exposure:
 
         image_type = exposure.image_type
@@ -45,23 +266,367 @@ class ThorCamera(BaseCamera):
 
         exposure.obstime = astropy.time.Time.now()
 
+        start = time.perf_counter()
         data = await self._sdk_camera.expose_async(exposure.exptime)
         exposure.data = data
+        self.stage_timings["expose"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._record_frame_stats(exposure)
+        self._correct_bad_pixels(exposure)
+        self.stage_timings["correct"] = time.perf_counter() - start
 
         return exposure
 
+    async def _post_process_internal(self, exposure: Exposure, **kwargs) -> Exposure:
+        """Adds the demosaiced or polarisation images for non-monochrome sensors."""
+
+        if exposure.data is None or not self.camera_params.get("process_frames", True):
+            return exposure
+
+        if self._sdk_camera.sensor_type == SENSOR_TYPE.MONOCHROME:
+            return exposure
+
+        self.notify(CameraEvent.EXPOSURE_POST_PROCESSING)
+
+        start = time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        hdus = await loop.run_in_executor(
+            None,
+            partial(self._get_processed_hdus, exposure.data),
+        )
+
+        for hdu in hdus:
+            exposure.add_hdu(hdu)
+
+        self.stage_timings["post_process"] = time.perf_counter() - start
+
+        return exposure
+
+    def _get_processed_hdus(self, data) -> list[ImageHDU]:
+        """Returns the extensions with the processed images for the sensor type."""
+
+        sdk_camera = self._sdk_camera
+
+        if sdk_camera.sensor_type == SENSOR_TYPE.BAYER:
+            assert sdk_camera.filter_array_phase is not None
+            pattern = BAYER_PATTERNS[sdk_camera.filter_array_phase]
+            rgb = demosaic_bilinear(data, pattern)
+            return [ImageHDU(data=rgb, name="RGB")]
+
+        elif sdk_camera.sensor_type == SENSOR_TYPE.MONOCHROME_POLARIZED:
+            assert sdk_camera.polar_phase is not None
+            angle = POLAR_ANGLES[sdk_camera.polar_phase]
+            products = get_polarization_products(data, angle)
+            return [
+                ImageHDU(data=numpy.ascontiguousarray(image), name=name)
+                for name, image in products.items()
+            ]
+
+        return []
+
+    def _status_internal(self) -> Dict[str, Any]:
+        """Returns the settings of the camera and the last stage timings, in ms."""
+
+        sdk_camera = self._sdk_camera
+
+        status = {
+            "frames_to_buffer": sdk_camera.frames_to_buffer,
+            "frame_rate": sdk_camera.frame_rate or -999.0,
+            "drop_policy": sdk_camera.drop_policy or "NA",
+        }
+
+        # The legacy actor cannot output nested dictionaries.
+        for stage, duration in self.stage_timings.items():
+            status[f"{stage}_time"] = round(duration * 1000, 3)
+
+        return status
+
+    def get_header_template(self) -> Header:
+        """Returns the header with the cards that are static for this camera.
+
+        The template is built the first time it is requested after connecting and
+        then reused for each exposure. It is rebuilt when the settings of the
+        camera change, or after `.invalidate_header_template` is called.
+
+        """
+
+        version = self._sdk_camera.settings_version
+
+        if self._header_template is None or self._header_template[0] != version:
+            self._header_template = (version, self._build_header_template())
+
+        return self._header_template[1]
+
+    def invalidate_header_template(self):
+        """Forces the header template to be rebuilt for the next exposure."""
+
+        self._header_template = None
+
+    def _build_header_template(self) -> Header:
+        """Evaluates the static header cards for the connected camera."""
+
+        sdk_camera = self._sdk_camera
+
+        exposure = Exposure(self)
+
+        header = Header()
+        for name in STATIC_DEFAULT_CARDS:
+            header.append(Card(name).evaluate(exposure))
+
+        min_exptime, max_exptime = sdk_camera.exposure_time_range
+
+        header.append(("SENSTYPE", sdk_camera.sensor_type.name, "Sensor type"))
+        header.append(("USBTYPE", sdk_camera.usb_type.name, "USB port type"))
+        header.append(("SENSWID", sdk_camera.width, "Sensor width [pixels]"))
+        header.append(("SENSHGT", sdk_camera.height, "Sensor height [pixels]"))
+        header.append(("EXPMIN", min_exptime, "Minimum exposure time [s]"))
+        header.append(("EXPMAX", max_exptime, "Maximum exposure time [s]"))
+        header.append(
+            ("READTIME", sdk_camera.readout_time / 1e9, "Sensor readout time [s]")
+        )
+
+        if sdk_camera.filter_array_phase is not None:
+            pattern = BAYER_PATTERNS[sdk_camera.filter_array_phase]
+            header.append(("BAYERPAT", pattern, "Bayer pattern of top-left pixels"))
+        elif sdk_camera.polar_phase is not None:
+            angle = POLAR_ANGLES[sdk_camera.polar_phase]
+            header.append(("POLANGLE", angle, "Polariser angle of top-left pixel"))
+
+        header.append(
+            ("FRBUFFER", sdk_camera.frames_to_buffer, "Frames buffered by the SDK")
+        )
+        header.append(("FRMRATE", sdk_camera.frame_rate or "NA", "Frame rate [fps]"))
+        header.append(
+            ("DRPOLICY", sdk_camera.drop_policy or "NA", "Dropped frames policy")
+        )
+
+        return header
+
+    async def abort(self) -> float:
+        """Aborts the ongoing exposure, if any.
+
+        The camera is disarmed and its pending frames discarded. Returns the abort
+        latency in seconds.
+
+        """
+
+        latency = await self._sdk_camera.abort()
+        self.log(f"acquisition aborted in {latency * 1000:.1f} ms.")
+
+        return latency
+
+    def _record_frame_stats(self, exposure: Exposure):
+        """Adds the frame counters to the exposure and logs dropped frames."""
+
+        frame_stats = self.frame_stats
+
+        exposure.frame_number = frame_stats.last_frame
+        exposure.n_dropped = frame_stats.dropped_in_sequence
+        exposure.dropped_frames = format_frame_gaps(frame_stats.gaps)
+
+        self._log_dropped_frames()
+
+    def _correct_bad_pixels(self, exposure: Exposure):
+        """Corrects the bad pixels in the exposure data, if a map is available."""
+
+        exposure.bad_pixels_corrected = False
+        exposure.n_bad_pixels = 0
+
+        if exposure.data is None or self.bad_pixel_map is None:
+            return
+
+        if not self.camera_params.get("correct_bad_pixels", True):
+            return
+
+        # The correction is done in place. Never write to a buffer owned by the SDK.
+        data = exposure.data
+        if not data.flags.owndata:
+            data = data.copy()
+
+        exposure.data = self.bad_pixel_map.correct(data)
+
+        exposure.bad_pixels_corrected = True
+        exposure.n_bad_pixels = len(self.bad_pixel_map.bad_pixels)
+
+    def _get_bad_pixel_stride(self) -> int:
+        """Returns the distance between pixels of the same channel on the sensor."""
+
+        # Bayer and polarised sensors have a 2x2 filter pattern. Bad pixels are
+        # corrected on the raw frame, so only pixels of the same channel can be used.
+        if self._sdk_camera.sensor_type == SENSOR_TYPE.MONOCHROME:
+            return 1
+
+        return 2
+
+    def get_bad_pixel_map_path(self) -> pathlib.Path:
+        """Returns the path to the bad pixel map for this camera."""
+
+        dirname = pathlib.Path(config["bad_pixel_maps"]["dirname"]).expanduser()
+        return dirname / f"badpix-{self.uid}.npz"
+
+    def _load_bad_pixel_map(self):
+        """Loads the bad pixel map for the camera, if it exists."""
+
+        self.bad_pixel_map = None
+
+        path = self.get_bad_pixel_map_path()
+        if not path.exists():
+            return
+
+        bad_pixel_map = BadPixelMap.load(path)
+
+        sensor_shape = (self._sdk_camera.height, self._sdk_camera.width)
+        if bad_pixel_map.shape != sensor_shape:
+            self.log(f"bad pixel map {path!s} does not match sensor.", logging.WARNING)
+            return
+
+        if bad_pixel_map.stride != self._get_bad_pixel_stride():
+            self.log(
+                f"bad pixel map {path!s} was not built for a "
+                f"{self._sdk_camera.sensor_type.name} sensor. Rebuild it.",
+                logging.WARNING,
+            )
+            return
+
+        self.bad_pixel_map = bad_pixel_map
+        self.log(f"loaded bad pixel map {path!s}.")
+
+    async def build_bad_pixel_map(
+        self,
+        exptime: float,
+        n_frames: int = 10,
+        n_sigma: float = 5.0,
+    ) -> BadPixelMap:
+        """Builds a bad pixel map from a sequence of frames and saves it.
+
+        The new map replaces the current one and is used for all subsequent
+        exposures. See `.BadPixelMap.from_frames` for details on how hot and dead
+        pixels are identified. For Bayer and polarised sensors the pixels of each
+        channel of the filter pattern are analysed and corrected separately.
+
+        """
+
+        frames = [
+            data
+            async for _, data in self._sdk_camera.expose_sequence_async(
+                n_frames,
+                exptime,
+            )
+        ]
+
+        loop = asyncio.get_running_loop()
+        bad_pixel_map = await loop.run_in_executor(
+            None,
+            partial(
+                BadPixelMap.from_frames,
+                frames,
+                n_sigma=n_sigma,
+                stride=self._get_bad_pixel_stride(),
+            ),
+        )
+
+        path = self.get_bad_pixel_map_path()
+        bad_pixel_map.save(path)
+
+        self.bad_pixel_map = bad_pixel_map
+        self.log(
+            f"saved bad pixel map {path!s} with {bad_pixel_map.n_hot} hot "
+            f"and {bad_pixel_map.n_dead} dead pixels."
+        )
+
+        return bad_pixel_map
+
+    def _log_dropped_frames(self):
+        """Logs the frames dropped in the last sequence, if any."""
+
+        frame_stats = self.frame_stats
+
+        if frame_stats.dropped_in_sequence > 0:
+            self.log(
+                f"{frame_stats.dropped_in_sequence} frames dropped. "
+                f"Total dropped frames: {frame_stats.dropped}.",
+                logging.WARNING,
+            )
+
+    async def capture_to_spool(
+        self,
+        exptime: float,
+        n_frames: int,
+        filename: Optional[str] = None,
+    ) -> Tuple[str, int]:
+        """Captures a burst of frames to a memory-mapped `.FrameSpool`.
+
+        Frames are copied from the SDK buffer directly to the spool slots, without
+        creating FITS files. Use `.spool_to_fits` to convert the spool. If
+        ``filename`` is not provided, the spool is written to the image namer
+        directory with a name that includes the time and a sequence number. Returns
+        the path to the spool file and the number of frames written to it.
+
+        """
+
+        if filename is None:
+            timestamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+            for seq in itertools.count(1):
+                filename = os.path.join(
+                    self.image_namer.dirname,
+                    f"{self.name}-{timestamp}-{seq:03d}.spool",
+                )
+                if not os.path.exists(filename):
+                    break
+
+        sdk_camera = self._sdk_camera
+
+        spool = FrameSpool.create(
+            filename,
+            n_frames,
+            sdk_camera.height,
+            sdk_camera.width,
+            uid=str(self.uid),
+        )
+
+        try:
+            async for frame_count, data in sdk_camera.expose_sequence_async(
+                n_frames,
+                exptime,
+                copy=False,
+            ):
+                spool.append(
+                    data,
+                    frame_count=frame_count,
+                    timestamp=time.time(),
+                    exptime=exptime,
+                )
+        finally:
+            n_written = len(spool)
+            spool.close()
+
+        self._log_dropped_frames()
+
+        return str(filename), n_written
+
 
 class ThorCameraSystem(CameraSystem[ThorCamera]):
-    """Thorlabs camera system."""
+    """Thorlabs camera system.
+
+    Parameters
+    ----------
+    sdk
+        The `.TL_SDK` instance to use. If not provided, the Thorlabs SDK is loaded.
+    args, kwargs
+        Arguments to pass to `~basecam.camera.CameraSystem`.
+
+    """
 
     __version__ = thorcam_version
 
     camera_class = ThorCamera
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, sdk: Optional[TL_SDK] = None, **kwargs):
 
         self.camera_class: Type[ThorCamera] = ThorCamera
-        self.sdk = TL_SDK()
+        self.sdk = sdk or TL_SDK()
 
         super().__init__(*args, **kwargs)
 
@@ -79,13 +644,62 @@ class ThorCameraSystem(CameraSystem[ThorCamera]):
 
         return self.sdk.list_available_cameras()
 
-    async def start_camera_poller(self):
-        raise NotImplementedError("This camera system does not allow polling.")
+    async def _check_cameras(self):
+        """Checks for cameras that have been lost, reconnected, or added.
+
+        This is an internal function to be used only by the camera poller. Cameras
+        that stop responding are closed, but they are kept in `.cameras` so that
+        they can be reconnected with the same settings. The SDK can only discover
+        cameras once after it opens, so it is reopened to look for new cameras when
+        no camera is open. Otherwise, only the lost cameras are reopened.
+
+        """
+
+        for camera in self.cameras:
+            if camera.connected and not camera.is_responsive():
+                camera.handle_connection_lost()
+
+        if len(self.sdk.open_cameras) == 0:
+            loop = asyncio.get_running_loop()
+            try:
+                uids = await loop.run_in_executor(
+                    None,
+                    partial(self.sdk.list_available_cameras, refresh=True),
+                )
+            except SDKError as err:
+                self.log(f"failed discovering cameras: {err}", logging.WARNING)
+                return
+        else:
+            uids = [camera.uid for camera in self.cameras if not camera.connected]
+
+        for uid in uids:
+            camera = self.get_camera(uid=uid)
+            if camera:
+                if camera.connected:
+                    continue
+                try:
+                    await camera.connect()
+                except CameraConnectionError as err:
+                    self.log(f"cannot reconnect camera {uid!r}: {err}", logging.DEBUG)
+                    continue
+                self.log(f"reconnected camera {camera.name!r}.", logging.INFO)
+            elif self.include and uid not in self.include:
+                continue
+            elif self.exclude and uid in self.exclude:
+                continue
+            else:
+                self.log(f"detected new camera with UID {uid!r}.", logging.INFO)
+                try:
+                    await self.add_camera(uid=uid)
+                except CameraConnectionError as err:
+                    self.log(f"cannot add camera {uid!r}: {err}", logging.WARNING)
 
     async def disconnect(self):
 
+        await self.stop_camera_poller()
+
         for camera in self.cameras:
-            camera._sdk_camera.close()
+            await camera.disconnect()
 
         self.sdk.close()
 
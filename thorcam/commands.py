@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: commands.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+
+import click
+
+from basecam.actor.tools import get_cameras
+from clu.parsers.click import CluCommand
+
+from thorcam.exceptions import SDKError
+from thorcam.spool import spool_to_fits
+
+
+__all__ = ["THORCAM_COMMANDS", "frames", "spool", "bad_pixels", "abort"]
+
+
+@click.command(cls=CluCommand)
+@click.argument("CAMERAS", nargs=-1, type=str, required=False)
+@click.option("--reset", is_flag=True, help="Resets the frame counters.")
+async def frames(command, cameras, reset):
+    """Reports the frame counters and dropped frames."""
+
+    cameras = get_cameras(command, cameras=cameras, fail_command=True)
+    if not cameras:  # pragma: no cover
+        return
+
+    for camera in cameras:
+        if reset:
+            camera.frame_stats.reset()
+
+        frame_stats = camera.frame_stats.to_dict()
+        command.info(frame_stats={"camera": camera.name, **frame_stats})
+
+    command.finish()
+
+
+async def spool_one_camera(command, camera, exptime, n_frames, convert, cube):
+    """Captures a burst to a spool and, optionally, converts it to FITS."""
+
+    try:
+        filename, n_written = await camera.capture_to_spool(exptime, n_frames)
+    except (SDKError, OSError, ValueError) as err:
+        command.error(error={"camera": camera.name, "error": str(err)})
+        return False
+
+    command.info(
+        spool={
+            "camera": camera.name,
+            "filename": filename,
+            "n_frames": n_written,
+            "dropped": camera.frame_stats.dropped_in_sequence,
+        }
+    )
+
+    if convert:
+        loop = asyncio.get_running_loop()
+        try:
+            files = await loop.run_in_executor(
+                None,
+                partial(spool_to_fits, filename, cube=cube),
+            )
+        except Exception as err:
+            command.error(error={"camera": camera.name, "error": str(err)})
+            return False
+
+        command.info(spool_fits={"camera": camera.name, "files": files})
+
+    return True
+
+
+@click.command(cls=CluCommand)
+@click.argument("CAMERAS", nargs=-1, type=str, required=False)
+@click.argument("EXPTIME", type=float)
+@click.argument("N_FRAMES", type=int)
+@click.option(
+    "--convert",
+    is_flag=True,
+    help="Converts the spool to FITS once the capture is done.",
+)
+@click.option(
+    "--cube",
+    is_flag=True,
+    help="Converts the spool to a single FITS cube.",
+)
+async def spool(command, cameras, exptime, n_frames, convert, cube):
+    """Captures a burst of frames to a memory-mapped spool file."""
+
+    cameras = get_cameras(command, cameras=cameras, fail_command=True)
+    if not cameras:  # pragma: no cover
+        return
+
+    results = await asyncio.gather(
+        *[
+            spool_one_camera(command, camera, exptime, n_frames, convert, cube)
+            for camera in cameras
+        ]
+    )
+
+    if not all(results):
+        return command.fail("One or more cameras failed to spool.")
+
+    command.finish()
+
+
+@click.command(cls=CluCommand, name="bad-pixels")
+@click.argument("CAMERAS", nargs=-1, type=str, required=False)
+@click.argument("EXPTIME", type=float)
+@click.option(
+    "-n",
+    "--n-frames",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of frames to use.",
+)
+@click.option(
+    "--sigma",
+    type=float,
+    default=5.0,
+    show_default=True,
+    help="Rejection threshold in units of the robust standard deviation.",
+)
+async def bad_pixels(command, cameras, exptime, n_frames, sigma):
+    """Builds and saves new bad pixel maps from a sequence of frames."""
+
+    cameras = get_cameras(command, cameras=cameras, fail_command=True)
+    if not cameras:  # pragma: no cover
+        return
+
+    for camera in cameras:
+        try:
+            bad_pixel_map = await camera.build_bad_pixel_map(
+                exptime,
+                n_frames=n_frames,
+                n_sigma=sigma,
+            )
+        except (SDKError, OSError, ValueError) as err:
+            return command.fail(error={"camera": camera.name, "error": str(err)})
+
+        command.info(
+            bad_pixels={
+                "camera": camera.name,
+                "n_hot": bad_pixel_map.n_hot,
+                "n_dead": bad_pixel_map.n_dead,
+                "filename": str(camera.get_bad_pixel_map_path()),
+            }
+        )
+
+    command.finish()
+
+
+@click.command(cls=CluCommand)
+@click.argument("CAMERAS", nargs=-1, type=str, required=False)
+async def abort(command, cameras):
+    """Aborts ongoing exposures and reports the abort latency."""
+
+    cameras = get_cameras(command, cameras=cameras, fail_command=True)
+    if not cameras:  # pragma: no cover
+        return
+
+    for camera in cameras:
+        try:
+            latency = await camera.abort()
+        except (SDKError, asyncio.TimeoutError) as err:
+            return command.fail(error={"camera": camera.name, "error": str(err)})
+
+        command.info(abort={"camera": camera.name, "latency": round(latency, 6)})
+
+    command.finish()
+
+
+#: Commands added to the default ``basecam`` parser.
+THORCAM_COMMANDS = [frames, spool, bad_pixels, abort]
@@ -11,3 +11,9 @@ class SDKError(Exception):
     """An exception was raised in the Thorlabs SDK."""
 
     pass
+
+
+class AbortedError(SDKError):
+    """An acquisition was aborted."""
+
+    pass
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: loadtest.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import pathlib
+import random
+import resource
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from typing import Any, Callable, Optional, Sequence
+
+import numpy
+
+from thorcam import config
+from thorcam.actor import ThorActor
+from thorcam.camera import ThorCameraSystem
+from thorcam.mock import get_virtual_sdk
+
+
+__all__ = ["LoadTestResult", "ActorClient", "run_load_test", "run_load_test_sweep"]
+
+
+#: Default port for the actor started by the load test.
+LOADTEST_PORT: int = config["load_test"]["port"]
+
+#: Time, in seconds, after which a command without a reply is counted as failed.
+COMMAND_TIMEOUT: float = config["load_test"]["command_timeout"]
+
+#: Interval, in seconds, at which the event loop lag and the memory are sampled.
+MONITOR_INTERVAL = 0.05
+
+
+def get_rss() -> int:
+    """Returns the resident set size of the process, in bytes."""
+
+    try:
+        with open("/proc/self/statm") as fd:
+            return int(fd.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Only the peak RSS is available. It is in kilobytes on Linux.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values: Sequence[float], percentile: float) -> float:
+    """Returns a percentile of a list of durations in milliseconds."""
+
+    if len(values) == 0:
+        return numpy.nan
+
+    return round(float(numpy.percentile(values, percentile)) * 1000, 3)
+
+
+@dataclass
+class LoadTestResult:
+    """The measurements of a load test run."""
+
+    #: Number of virtual cameras.
+    n_cameras: int
+
+    #: Duration of the run, in seconds.
+    duration: float
+
+    #: Latency of each command, in seconds, by command name.
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+
+    #: Number of failed commands by command name.
+    failed: dict[str, int] = field(default_factory=dict)
+
+    #: Delays of the event loop over the monitor interval, in seconds.
+    loop_lag: list[float] = field(default_factory=list)
+
+    #: Resident memory at the start, end, and peak of the run, in bytes.
+    rss_start: int = 0
+    rss_end: int = 0
+    rss_peak: int = 0
+
+    #: Number and total size of the files written.
+    n_files: int = 0
+    bytes_written: int = 0
+
+    def summary(self) -> dict[str, Any]:
+        """Returns a dictionary with the statistics of the run."""
+
+        mb = 1024**2
+
+        summary: dict[str, Any] = {
+            "n_cameras": self.n_cameras,
+            "duration": round(self.duration, 1),
+            "loop_lag_p50_ms": _percentile(self.loop_lag, 50),
+            "loop_lag_p99_ms": _percentile(self.loop_lag, 99),
+            "loop_lag_max_ms": _percentile(self.loop_lag, 100),
+            "rss_start_mb": round(self.rss_start / mb, 1),
+            "rss_growth_mb": round((self.rss_end - self.rss_start) / mb, 1),
+            "rss_peak_mb": round(self.rss_peak / mb, 1),
+            "files_per_s": round(self.n_files / self.duration, 2),
+            "mb_per_s": round(self.bytes_written / mb / self.duration, 2),
+        }
+
+        for command, latencies in self.latencies.items():
+            summary[f"{command}_n"] = len(latencies)
+            summary[f"{command}_failed"] = self.failed.get(command, 0)
+            summary[f"{command}_p50_ms"] = _percentile(latencies, 50)
+            summary[f"{command}_p95_ms"] = _percentile(latencies, 95)
+            summary[f"{command}_max_ms"] = _percentile(latencies, 100)
+
+        return summary
+
+
+class ActorClient:
+    """A minimal client that sends commands to a legacy actor and times them.
+
+    Parameters
+    ----------
+    host
+        The host on which the actor is running.
+    port
+        The port on which the actor is listening.
+    timeout
+        Time to wait for a command to finish, in seconds.
+
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = COMMAND_TIMEOUT):
+
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        self._command_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> ActorClient:
+        """Connects to the actor."""
+
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host,
+            self.port,
+        )
+        self._read_task = asyncio.create_task(self._read_replies())
+
+        return self
+
+    async def stop(self):
+        """Disconnects from the actor."""
+
+        if self._read_task:
+            self._read_task.cancel()
+
+        if self._writer:
+            self._writer.close()
+            await self._writer.wait_closed()
+
+    async def _read_replies(self):
+        """Resolves the pending commands when their completion reply arrives."""
+
+        assert self._reader
+
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+
+            parts = line.decode().split(maxsplit=3)
+            if len(parts) < 3 or not parts[1].isdigit():
+                continue
+
+            _, command_id, code = parts[:3]
+            if code not in (":", "f"):
+                continue
+
+            future = self._pending.pop(int(command_id), None)
+            if future and not future.done():
+                future.set_result(code == ":")
+
+    async def send(self, command_string: str) -> tuple[bool, float]:
+        """Sends a command and waits until it finishes.
+
+        Returns whether the command succeeded and its latency in seconds. A command
+        that does not finish within the timeout is considered failed.
+
+        """
+
+        assert self._writer
+
+        self._command_id += 1
+        command_id = self._command_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+
+        start = time.perf_counter()
+        self._writer.write(f"{command_id} {command_string}\n".encode())
+        await self._writer.drain()
+
+        try:
+            success = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(command_id, None)
+            success = False
+
+        return success, time.perf_counter() - start
+
+
+async def run_load_test(
+    n_cameras: int,
+    duration: float = 30.0,
+    exptime: float = 0.01,
+    frames: Optional[numpy.ndarray] = None,
+    frame_rate: Optional[float] = None,
+    status_interval: Optional[float] = 0.5,
+    abort_interval: Optional[float] = None,
+    port: int = LOADTEST_PORT,
+    command_timeout: float = COMMAND_TIMEOUT,
+) -> LoadTestResult:
+    """Runs the actor with virtual cameras under a load of concurrent commands.
+
+    A `.ThorActor` is started with a `.ThorCameraSystem` backed by the virtual
+    cameras of `.get_virtual_sdk`, and commanded over TCP as a real client would do.
+    ``expose`` commands for all the cameras are issued back to back, while
+    ``status`` and ``abort`` commands are issued periodically. The images are
+    written to a temporary directory that is removed after the run.
+
+    Parameters
+    ----------
+    n_cameras
+        The number of virtual cameras.
+    duration
+        How long to generate traffic, in seconds.
+    exptime
+        The exposure time of each exposure.
+    frames
+        The frames to replay. See `.load_frames`.
+    frame_rate
+        The maximum frame rate of the virtual cameras.
+    status_interval
+        Interval between ``status`` commands. `None` to disable them.
+    abort_interval
+        Interval between ``abort`` commands, each one to a random camera. `None` to
+        disable them. Aborted exposures make the ``expose`` command fail.
+    port
+        The port on which the actor listens.
+    command_timeout
+        Time to wait for each command to finish. Commands that time out are counted
+        as failed, so that a wedged actor does not hang the run.
+
+    """
+
+    gc.collect()
+
+    result = LoadTestResult(n_cameras, duration)
+    result.rss_start = result.rss_peak = get_rss()
+
+    sdk = get_virtual_sdk(n_cameras, frames=frames, frame_rate=frame_rate)
+    camera_system = await ThorCameraSystem(sdk=sdk).setup()
+
+    camera_names = [camera.name for camera in camera_system.cameras]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+
+        actor = ThorActor(
+            camera_system,
+            name="thorcam",
+            host="127.0.0.1",
+            port=port,
+            data_dir=data_dir,
+            image_name="{camera.name}-{num:04d}.fits",
+        )
+        await actor.start()
+
+        client = await ActorClient("127.0.0.1", port, command_timeout).start()
+
+        stop = asyncio.Event()
+
+        async def run_command(name: str, command_string: str):
+            success, latency = await client.send(command_string)
+            result.latencies.setdefault(name, []).append(latency)
+            if not success:
+                result.failed[name] = result.failed.get(name, 0) + 1
+
+        async def wait(interval: float) -> bool:
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            return not stop.is_set()
+
+        async def expose_traffic():
+            command_string = f"expose {' '.join(camera_names)} {exptime}"
+            while not stop.is_set():
+                await run_command("expose", command_string)
+
+        async def periodic_traffic(name: str, interval: float, get_command: Callable):
+            while await wait(interval):
+                await run_command(name, get_command())
+
+        async def monitor():
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(MONITOR_INTERVAL)
+                result.loop_lag.append(time.perf_counter() - start - MONITOR_INTERVAL)
+                result.rss_peak = max(result.rss_peak, get_rss())
+                if stop.is_set():
+                    break
+
+        tasks = [
+            asyncio.create_task(expose_traffic()),
+            asyncio.create_task(monitor()),
+        ]
+
+        if status_interval:
+            tasks.append(
+                asyncio.create_task(
+                    periodic_traffic("status", status_interval, lambda: "status")
+                )
+            )
+
+        if abort_interval:
+            tasks.append(
+                asyncio.create_task(
+                    periodic_traffic(
+                        "abort",
+                        abort_interval,
+                        lambda: f"abort {random.choice(camera_names)}",
+                    )
+                )
+            )
+
+        start = time.perf_counter()
+
+        await asyncio.sleep(duration)
+        stop.set()
+
+        # Let the commands in progress finish.
+        await asyncio.gather(*tasks)
+
+        result.duration = time.perf_counter() - start
+
+        files = [path for path in pathlib.Path(data_dir).rglob("*") if path.is_file()]
+        result.n_files = len(files)
+        result.bytes_written = sum(path.stat().st_size for path in files)
+
+        await client.stop()
+        await actor.stop()
+        await camera_system.disconnect()
+
+    result.rss_end = get_rss()
+
+    return result
+
+
+async def run_load_test_sweep(
+    camera_counts: Sequence[int],
+    **kwargs,
+) -> list[LoadTestResult]:
+    """Runs `.run_load_test` for an increasing number of cameras.
+
+    Additional keyword arguments are passed to `.run_load_test`.
+
+    """
+
+    results = []
+    for n_cameras in sorted(camera_counts):
+        results.append(await run_load_test(n_cameras, **kwargs))
+
+    return results
@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: mock.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import pathlib
+import time
+from ctypes import c_ushort
+
+from typing import Optional, Sequence, Union
+
+import numpy
+from astropy.io import fits
+
+from thorcam.exceptions import SDKError
+from thorcam.spool import FrameSpool
+from thorcam.tl_camera import SENSOR_TYPE, TL_SDK, USB_PORT_TYPE
+
+
+__all__ = ["VirtualCamera", "VirtualLibc", "get_virtual_sdk", "load_frames"]
+
+
+PathLike = Union[str, pathlib.Path]
+
+
+def _value(arg):
+    """Returns the value of a ctypes argument or the argument itself."""
+
+    return getattr(arg, "value", arg)
+
+
+def load_frames(
+    paths: Sequence[PathLike] = [],
+    shape: tuple[int, int] = (1080, 1440),
+    n_frames: int = 4,
+) -> numpy.ndarray:
+    """Loads recorded frames to replay with the virtual cameras.
+
+    Parameters
+    ----------
+    paths
+        A list of FITS files, whose primary HDU is read, or spool files, from which
+        all the valid frames are read. All frames must have the same shape.
+    shape
+        If ``paths`` is empty, the shape of the synthetic frames to generate.
+    n_frames
+        The number of synthetic frames to generate.
+
+    Returns
+    -------
+    frames
+        A ``uint16`` array with shape ``(n_frames, height, width)``.
+
+    """
+
+    if len(paths) == 0:
+        rng = numpy.random.default_rng(42)
+        return rng.poisson(500, size=(n_frames, *shape)).astype(numpy.uint16)
+
+    frames = []
+    for path in map(pathlib.Path, paths):
+        if path.suffix == ".spool":
+            with FrameSpool(path) as spool:
+                frames += list(spool.frames[spool.valid_slots()])
+        else:
+            frames.append(fits.getdata(path))
+
+    if len(set(frame.shape for frame in frames)) != 1:
+        raise ValueError("All the frames must have the same shape.")
+
+    return numpy.array(frames, dtype=numpy.uint16)
+
+
+class VirtualCamera:
+    """A virtual camera that replays recorded frames.
+
+    Frames are delivered after the exposure time from a software trigger. When the
+    camera is armed for more than one frame, frames are produced every exposure time
+    or at the frame rate, whichever is slower. As with the real camera, frames are
+    lost if more than ``frames_to_buffer`` are pending.
+
+    Parameters
+    ----------
+    serial
+        The serial number of the camera.
+    frames
+        The frames to replay, with shape ``(n_frames, height, width)``.
+    frame_rate
+        The maximum frame rate of the camera. `None` for no limit.
+    sensor_type
+        The sensor type to report.
+
+    """
+
+    def __init__(
+        self,
+        serial: str,
+        frames: numpy.ndarray,
+        frame_rate: Optional[float] = None,
+        sensor_type: SENSOR_TYPE = SENSOR_TYPE.MONOCHROME,
+    ):
+
+        self.serial = serial
+        self.frames = frames
+        self.height, self.width = frames.shape[1:]
+
+        self.max_frame_rate = frame_rate
+        self.sensor_type = sensor_type
+
+        #: Whether the camera is connected. Set to `False` to simulate a lost camera.
+        self.plugged = True
+
+        self.is_open = False
+        self.armed = False
+
+        self.exposure_time = 10000  # us
+        self.readout_time = 10000000  # ns
+        self.poll_timeout = 0  # ms
+        self.frames_per_trigger = 1
+        self.frame_rate: Optional[float] = None
+
+        self.frame_count = 0
+        self.trigger_time: Optional[float] = None
+
+        self._buffer = numpy.empty((0, self.height, self.width), dtype=numpy.uint16)
+        self._next_replay = 0
+
+    def arm(self, frames_to_buffer: int):
+        """Arms the camera and allocates the frame buffer."""
+
+        if self._buffer.shape[0] != frames_to_buffer:
+            self._buffer = numpy.empty(
+                (frames_to_buffer, self.height, self.width),
+                dtype=numpy.uint16,
+            )
+
+        self.armed = True
+        self.frame_count = 0
+        self.trigger_time = None
+
+    def get_frame_interval(self) -> float:
+        """Returns the time between consecutive frames, in seconds."""
+
+        interval = self.exposure_time / 1e6
+
+        frame_rate = self.frame_rate or self.max_frame_rate
+        if frame_rate:
+            interval = max(interval, 1 / frame_rate)
+
+        return interval
+
+    def get_frame(self) -> Optional[numpy.ndarray]:
+        """Returns the next pending frame, waiting up to the poll timeout."""
+
+        if not self.armed or self.trigger_time is None:
+            return None
+
+        if self.frames_per_trigger > 0 and self.frame_count >= self.frames_per_trigger:
+            return None
+
+        interval = self.get_frame_interval()
+        first_frame = self.trigger_time + self.exposure_time / 1e6
+        first_frame += self.readout_time / 1e9
+
+        # Like the SDK, blocks until the frame is ready or the poll timeout expires.
+        ready = first_frame + self.frame_count * interval
+        wait = ready - time.time()
+        if wait > 0:
+            time.sleep(min(wait, self.poll_timeout / 1000))
+            if wait > self.poll_timeout / 1000:
+                return None
+
+        # Frames that did not fit in the buffer are lost.
+        n_ready = int((time.time() - first_frame) // interval) + 1
+        if self.frames_per_trigger > 0:
+            n_ready = min(n_ready, self.frames_per_trigger)
+        self.frame_count = max(self.frame_count + 1, n_ready - len(self._buffer) + 1)
+
+        slot = self._buffer[(self.frame_count - 1) % len(self._buffer)]
+        slot[:] = self.frames[self._next_replay]
+        self._next_replay = (self._next_replay + 1) % len(self.frames)
+
+        return slot
+
+
+class VirtualLibc:
+    """Implements the functions of the Thorlabs SDK used by `.TL_SDK`.
+
+    The discovery of cameras is limited to once after the SDK opens, as in the real
+    SDK. Use with `.get_virtual_sdk`.
+
+    Parameters
+    ----------
+    cameras
+        The virtual cameras connected to the system.
+
+    """
+
+    def __init__(self, cameras: Sequence[VirtualCamera]):
+
+        self.cameras = {camera.serial: camera for camera in cameras}
+
+        self.sdk_open = False
+        self.discovered = False
+
+        self._handles: dict[int, VirtualCamera] = {}
+        self._next_handle = 1
+        self._last_error = b""
+
+    def _error(self, message: str):
+        self._last_error = message.encode()
+        raise SDKError(message)
+
+    def _get_camera(self, handle) -> VirtualCamera:
+        camera = self._handles.get(_value(handle), None)
+        if camera is None or not camera.is_open:
+            self._error("Invalid camera handle.")
+        elif not camera.plugged:
+            self._error(f"Camera {camera.serial} is not connected.")
+        return camera
+
+    def tl_camera_get_last_error(self) -> bytes:
+        return self._last_error
+
+    def open_sdk(self):
+        if self.sdk_open:
+            self._error("The SDK is already open.")
+        self.sdk_open = True
+        self.discovered = False
+
+    def close_sdk(self):
+        self.sdk_open = False
+        for camera in self._handles.values():
+            camera.is_open = False
+        self._handles = {}
+
+    def tl_camera_discover_available_cameras(self, buffer, size: int):
+        if self.discovered:
+            self._error("Cameras can only be discovered once.")
+        self.discovered = True
+
+        serials = [camera.serial for camera in self.cameras.values() if camera.plugged]
+        value = " ".join(serials).encode()[: _value(size) - 1]
+        buffer.value = value
+
+    def open_camera(self, serial: bytes, handle):
+        camera = self.cameras.get(serial.rstrip(b"\0").decode(), None)
+        if camera is None or not camera.plugged:
+            self._error(f"Camera {serial!r} not found.")
+
+        camera.is_open = True
+        camera.armed = False
+
+        self._handles[self._next_handle] = camera
+        handle.value = self._next_handle
+        self._next_handle += 1
+
+    def close_camera(self, handle):
+        camera = self._handles.pop(_value(handle), None)
+        if camera is None:
+            self._error("Invalid camera handle.")
+        camera.is_open = False
+
+    def get_usb_port_type(self, handle, usb_type):
+        self._get_camera(handle)
+        usb_type.value = USB_PORT_TYPE.USB3_0.value
+
+    def get_camera_sensor_type(self, handle, sensor_type):
+        sensor_type.value = self._get_camera(handle).sensor_type.value
+
+    def get_color_filter_array_phase(self, handle, phase):
+        self._get_camera(handle)
+        phase.value = 0
+
+    def get_polar_phase(self, handle, phase):
+        self._get_camera(handle)
+        phase.value = 0
+
+    def get_sensor_readout_time(self, handle, readout_time):
+        readout_time.value = self._get_camera(handle).readout_time
+
+    def get_exposure_time_range(self, handle, min_exp_time, max_exp_time):
+        self._get_camera(handle)
+        min_exp_time.value = 40
+        max_exp_time.value = 26843531
+
+    def get_exposure_time(self, handle, exp_time):
+        exp_time.value = self._get_camera(handle).exposure_time
+
+    def set_exposure_time(self, handle, exp_time):
+        self._get_camera(handle).exposure_time = _value(exp_time)
+
+    def get_image_height(self, handle, height):
+        height.value = self._get_camera(handle).height
+
+    def get_image_width(self, handle, width):
+        width.value = self._get_camera(handle).width
+
+    def get_frame_rate_control_value_range(self, handle, min_rate, max_rate):
+        camera = self._get_camera(handle)
+        min_rate.value = 0.9
+        max_rate.value = camera.max_frame_rate or 200.0
+
+    def set_is_frame_rate_control_enabled(self, handle, enabled):
+        camera = self._get_camera(handle)
+        if not _value(enabled):
+            camera.frame_rate = None
+
+    def get_frame_rate_control_value(self, handle, frame_rate):
+        frame_rate.value = self._get_camera(handle).frame_rate or 0.0
+
+    def set_frame_rate_control_value(self, handle, frame_rate):
+        self._get_camera(handle).frame_rate = _value(frame_rate)
+
+    def set_is_led_on(self, handle, is_on):
+        self._get_camera(handle)
+
+    def get_is_armed(self, handle, is_armed):
+        is_armed.value = self._get_camera(handle).armed
+
+    def set_frames_per_trigger_zero_for_unlimited(self, handle, n_frames):
+        self._get_camera(handle).frames_per_trigger = _value(n_frames)
+
+    def arm(self, handle, frames_to_buffer):
+        self._get_camera(handle).arm(_value(frames_to_buffer))
+
+    def disarm(self, handle):
+        camera = self._get_camera(handle)
+        camera.armed = False
+        camera.trigger_time = None
+
+    def issue_software_trigger(self, handle):
+        camera = self._get_camera(handle)
+        if not camera.armed:
+            self._error("The camera is not armed.")
+        camera.trigger_time = time.time()
+
+    def set_image_poll_timeout(self, handle, timeout):
+        self._get_camera(handle).poll_timeout = _value(timeout)
+
+    def tl_camera_get_pending_frame_or_null(
+        self,
+        handle,
+        image_buffer,
+        frame_count,
+        metadata_pointer,
+        metadata_size,
+    ):
+        camera = self._get_camera(handle)
+
+        frame = camera.get_frame()
+        if frame is None:
+            return
+
+        image_buffer.contents = c_ushort.from_buffer(frame)
+        frame_count.value = camera.frame_count
+
+    get_pending_frame_or_null = tl_camera_get_pending_frame_or_null
+
+
+def get_virtual_sdk(
+    n_cameras: int = 1,
+    frames: Optional[numpy.ndarray] = None,
+    frame_rate: Optional[float] = None,
+    sensor_type: SENSOR_TYPE = SENSOR_TYPE.MONOCHROME,
+) -> TL_SDK:
+    """Returns a `.TL_SDK` with virtual cameras.
+
+    Parameters
+    ----------
+    n_cameras
+        The number of virtual cameras. Their serials are ``V0001``, ``V0002``, etc.
+    frames
+        The frames to replay. See `.load_frames`. If not provided, synthetic frames
+        are used.
+    frame_rate
+        The maximum frame rate of each camera.
+    sensor_type
+        The sensor type of the cameras.
+
+    """
+
+    if frames is None:
+        frames = load_frames()
+
+    cameras = [
+        VirtualCamera(
+            f"V{ii + 1:04d}",
+            frames,
+            frame_rate=frame_rate,
+            sensor_type=sensor_type,
+        )
+        for ii in range(n_cameras)
+    ]
+
+    return TL_SDK(libc=VirtualLibc(cameras))
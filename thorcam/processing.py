@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: processing.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy
+
+from thorcam.tl_camera import FILTER_ARRAY_PHASE, POLAR_PHASE
+
+
+__all__ = [
+    "BAYER_PATTERNS",
+    "POLAR_ANGLES",
+    "demosaic_bilinear",
+    "get_polarization_channels",
+    "get_polarization_products",
+]
+
+
+#: Bayer pattern, read left to right and top to bottom, for each filter phase.
+BAYER_PATTERNS = {
+    FILTER_ARRAY_PHASE.BAYER_RED: "RGGB",
+    FILTER_ARRAY_PHASE.BAYER_BLUE: "BGGR",
+    FILTER_ARRAY_PHASE.GREEN_LEFT_OF_RED: "GRBG",
+    FILTER_ARRAY_PHASE.GREEN_LEFT_OF_BLUE: "GBRG",
+}
+
+#: Polariser angle, in degrees, of the top-left pixel for each polar phase.
+POLAR_ANGLES = {
+    POLAR_PHASE.PHASE_0: 0,
+    POLAR_PHASE.PHASE_45: 45,
+    POLAR_PHASE.PHASE_90: 90,
+    POLAR_PHASE.PHASE_135: 135,
+}
+
+#: Polariser angles in each 2x2 superpixel of the sensor. The tile is shifted so
+#: that its top-left pixel matches the polar phase reported by the camera.
+POLARIZER_TILE = numpy.array([[90, 45], [135, 0]])
+
+_RB_KERNEL = numpy.array([[1, 2, 1], [2, 4, 2], [1, 2, 1]], dtype=numpy.float32) / 4
+_G_KERNEL = numpy.array([[0, 1, 0], [1, 4, 1], [0, 1, 0]], dtype=numpy.float32) / 4
+
+
+def _correlate3x3(
+    padded: numpy.ndarray,
+    kernel: numpy.ndarray,
+    out: numpy.ndarray,
+    buffer: numpy.ndarray,
+):
+    """Correlates a zero-padded array with a 3x3 kernel, writing to ``out``."""
+
+    height, width = out.shape
+
+    out.fill(0)
+    for dy, dx in zip(*numpy.nonzero(kernel)):
+        shifted = padded[dy : dy + height, dx : dx + width]
+        numpy.multiply(shifted, kernel[dy, dx], out=buffer)
+        out += buffer
+
+
+@lru_cache(maxsize=8)
+def _get_bayer_masks(shape: tuple[int, int], pattern: str):
+    """Returns the channel masks and normalisation weights for a Bayer pattern."""
+
+    height, width = shape
+
+    masks = numpy.zeros((3, height, width), dtype=bool)
+    for ii, colour in enumerate(pattern.upper()):
+        row, col = divmod(ii, 2)
+        masks["RGB".index(colour), row::2, col::2] = True
+
+    # The weights correct the interpolation on the edges, where some of the
+    # neighbours are missing. They are one everywhere else.
+    weights = numpy.empty((3, height, width), dtype=numpy.float32)
+    padded = numpy.zeros((height + 2, width + 2), dtype=numpy.float32)
+    buffer = numpy.empty(shape, dtype=numpy.float32)
+
+    for ii, kernel in enumerate((_RB_KERNEL, _G_KERNEL, _RB_KERNEL)):
+        padded[1:-1, 1:-1] = masks[ii]
+        _correlate3x3(padded, kernel, weights[ii], buffer)
+
+    weights = 1 / weights
+
+    masks.setflags(write=False)
+    weights.setflags(write=False)
+
+    return masks, weights
+
+
+def demosaic_bilinear(raw: numpy.ndarray, pattern: str = "RGGB") -> numpy.ndarray:
+    """Demosaics a Bayer image using bilinear interpolation.
+
+    Parameters
+    ----------
+    raw
+        The raw image from the Bayer sensor.
+    pattern
+        The Bayer pattern of the top-left 2x2 pixels, for example ``"RGGB"``.
+
+    Returns
+    -------
+    rgb
+        A ``float32`` array with shape ``(3, height, width)`` with the red, green,
+        and blue channels.
+
+    """
+
+    if raw.ndim != 2 or len(pattern) != 4:
+        raise ValueError("Invalid raw image or Bayer pattern.")
+
+    masks, weights = _get_bayer_masks(raw.shape, pattern.upper())
+
+    height, width = raw.shape
+
+    rgb = numpy.empty((3, height, width), dtype=numpy.float32)
+    padded = numpy.zeros((height + 2, width + 2), dtype=numpy.float32)
+    buffer = numpy.empty(raw.shape, dtype=numpy.float32)
+
+    for ii, kernel in enumerate((_RB_KERNEL, _G_KERNEL, _RB_KERNEL)):
+        numpy.multiply(raw, masks[ii], out=padded[1:-1, 1:-1])
+        _correlate3x3(padded, kernel, rgb[ii], buffer)
+        rgb[ii] *= weights[ii]
+
+    return rgb
+
+
+def get_polarization_channels(
+    raw: numpy.ndarray,
+    top_left_angle: int = 0,
+) -> dict[int, numpy.ndarray]:
+    """Returns the images for each polariser angle as views of the raw image.
+
+    Parameters
+    ----------
+    raw
+        The raw image from the polarised sensor.
+    top_left_angle
+        The angle of the polariser of the top-left pixel. See `.POLAR_ANGLES`.
+
+    Returns
+    -------
+    channels
+        A dictionary of angle (0, 45, 90, and 135 degrees) to the half-resolution
+        image with the pixels behind that polariser.
+
+    """
+
+    positions = numpy.argwhere(POLARIZER_TILE == top_left_angle)
+    if len(positions) == 0:
+        raise ValueError(f"Invalid polariser angle {top_left_angle}.")
+
+    drow, dcol = positions[0]
+
+    height, width = raw.shape[0] // 2, raw.shape[1] // 2
+
+    channels = {}
+    for (row, col), angle in numpy.ndenumerate(POLARIZER_TILE):
+        row0 = (row - drow) % 2
+        col0 = (col - dcol) % 2
+        channels[int(angle)] = raw[row0::2, col0::2][:height, :width]
+
+    return channels
+
+
+def get_polarization_products(
+    raw: numpy.ndarray,
+    top_left_angle: int = 0,
+) -> dict[str, numpy.ndarray]:
+    """Computes the polarisation channels, Stokes parameters, DoLP, and AoLP.
+
+    The Stokes parameters are calculated as :math:`S_0 = (I_0 + I_{45} + I_{90} +
+    I_{135}) / 2`, :math:`S_1 = I_0 - I_{90}`, and :math:`S_2 = I_{45} - I_{135}`.
+    The degree of linear polarisation is :math:`\\sqrt{S_1^2 + S_2^2} / S_0` and the
+    angle of linear polarisation, in degrees, is :math:`\\arctan(S_2, S_1) / 2`.
+
+    Returns
+    -------
+    products
+        A dictionary with the half-resolution images. Keys are ``I0``, ``I45``,
+        ``I90``, and ``I135`` for the intensity behind each polariser (as views of
+        ``raw``), ``S0``, ``S1``, and ``S2``, ``DOLP``, and ``AOLP``.
+
+    """
+
+    channels = get_polarization_channels(raw, top_left_angle)
+
+    i0, i45, i90, i135 = (
+        channels[angle].astype(numpy.float32) for angle in (0, 45, 90, 135)
+    )
+
+    s0 = i0 + i45
+    s0 += i90
+    s0 += i135
+    s0 *= 0.5
+
+    s1 = numpy.subtract(i0, i90, out=i0)
+    s2 = numpy.subtract(i45, i135, out=i45)
+
+    dolp = numpy.hypot(s1, s2)
+    numpy.divide(dolp, s0, out=dolp, where=s0 > 0)
+    dolp[s0 <= 0] = 0
+
+    aolp = numpy.arctan2(s2, s1)
+    numpy.degrees(aolp, out=aolp)
+    aolp *= 0.5
+
+    products = {f"I{angle}": channels[angle] for angle in (0, 45, 90, 135)}
+    products.update({"S0": s0, "S1": s1, "S2": s2, "DOLP": dolp, "AOLP": aolp})
+
+    return products
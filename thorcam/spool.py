@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @Author: José Sánchez-Gallego (gallegoj@uw.edu)
+# @Date: 2026-10-19
+# @Filename: spool.py
+# @License: BSD 3-clause (http://www.opensource.org/licenses/BSD-3-Clause)
+
+from __future__ import annotations
+
+import os
+import pathlib
+
+from typing import Optional, Union
+
+import numpy
+from astropy.io import fits
+from astropy.time import Time
+
+
+__all__ = ["FrameSpool", "spool_to_fits"]
+
+
+PathLike = Union[str, pathlib.Path]
+
+#: Identifies a spool file and the version of its layout.
+SPOOL_MAGIC = b"TCAMSPL1"
+
+#: Size of the spool header, in bytes. Frame metadata and data are aligned to it.
+SPOOL_BLOCK_SIZE = 4096
+
+HEADER_DTYPE = numpy.dtype(
+    [
+        ("magic", "S8"),
+        ("height", "<u4"),
+        ("width", "<u4"),
+        ("n_slots", "<u4"),
+        ("n_written", "<u4"),
+        ("uid", "S32"),
+    ]
+)
+
+METADATA_DTYPE = numpy.dtype(
+    [
+        ("valid", "u1"),
+        ("frame_count", "<i8"),
+        ("timestamp", "<f8"),
+        ("exptime", "<f8"),
+    ]
+)
+
+
+def _align(size: int) -> int:
+    """Rounds up a size to a multiple of `.SPOOL_BLOCK_SIZE`."""
+
+    return -(-size // SPOOL_BLOCK_SIZE) * SPOOL_BLOCK_SIZE
+
+
+class FrameSpool:
+    """A preallocated, memory-mapped file to which raw frames are appended.
+
+    The file contains a fixed-size header followed by a table with the metadata
+    of each frame and by ``n_slots`` slots of ``height x width`` ``uint16`` pixels.
+    A frame is marked as valid only after its data has been copied to the slot, so
+    the frames written before a crash can be recovered. Use `.create` to create a
+    new spool and `.spool_to_fits` to convert it to FITS.
+
+    Parameters
+    ----------
+    path
+        The path to an existing spool file.
+    mode
+        The mode in which to open the memory map. Use ``"r+"`` to append frames.
+
+    """
+
+    def __init__(self, path: PathLike, mode: str = "r"):
+
+        self.path = pathlib.Path(path)
+        self.closed = False
+
+        header = numpy.fromfile(self.path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header["magic"][0] != SPOOL_MAGIC:
+            raise ValueError(f"{self.path!s} is not a valid spool file.")
+
+        self.height = int(header["height"][0])
+        self.width = int(header["width"][0])
+        self.n_slots = int(header["n_slots"][0])
+        self.uid = header["uid"][0].decode()
+
+        metadata_size = _align(self.n_slots * METADATA_DTYPE.itemsize)
+        frame_size = self.height * self.width * 2
+
+        self._mmap = numpy.memmap(self.path, dtype=numpy.uint8, mode=mode)
+
+        self.header = self._mmap[: HEADER_DTYPE.itemsize].view(HEADER_DTYPE)
+
+        metadata_end = SPOOL_BLOCK_SIZE + self.n_slots * METADATA_DTYPE.itemsize
+        self.metadata = self._mmap[SPOOL_BLOCK_SIZE:metadata_end].view(METADATA_DTYPE)
+
+        data_start = SPOOL_BLOCK_SIZE + metadata_size
+        data_end = data_start + self.n_slots * frame_size
+        self.frames = (
+            self._mmap[data_start:data_end]
+            .view("<u2")
+            .reshape((self.n_slots, self.height, self.width))
+        )
+
+    @classmethod
+    def create(
+        cls,
+        path: PathLike,
+        n_slots: int,
+        height: int,
+        width: int,
+        uid: str = "",
+        overwrite: bool = False,
+    ) -> FrameSpool:
+        """Creates and preallocates a new spool file and opens it for writing."""
+
+        path = pathlib.Path(path)
+        if path.exists() and not overwrite:
+            raise FileExistsError(f"{path!s} already exists.")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        size = SPOOL_BLOCK_SIZE
+        size += _align(n_slots * METADATA_DTYPE.itemsize)
+        size += n_slots * height * width * 2
+
+        header = numpy.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = SPOOL_MAGIC
+        header["height"] = height
+        header["width"] = width
+        header["n_slots"] = n_slots
+        header["uid"] = uid.encode()
+
+        with open(path, "wb") as fd:
+            fd.truncate(size)
+            # Allocate the blocks now so that the disk cannot fill up mid-burst.
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd.fileno(), 0, size)
+            fd.write(header.tobytes())
+
+        return cls(path, mode="r+")
+
+    def __len__(self) -> int:
+        return int(self.header["n_written"][0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    @property
+    def full(self) -> bool:
+        """Whether all the slots have been written."""
+
+        return len(self) >= self.n_slots
+
+    def append(
+        self,
+        data: numpy.ndarray,
+        frame_count: int = 0,
+        timestamp: float = 0.0,
+        exptime: float = 0.0,
+    ) -> int:
+        """Copies a frame to the next free slot. Returns the slot index."""
+
+        index = len(self)
+        if index >= self.n_slots:
+            raise ValueError("The spool is full.")
+
+        self.frames[index] = data
+
+        metadata = self.metadata[index]
+        metadata["frame_count"] = frame_count
+        metadata["timestamp"] = timestamp
+        metadata["exptime"] = exptime
+        metadata["valid"] = 1
+
+        self.header["n_written"] = index + 1
+
+        return index
+
+    def valid_slots(self) -> numpy.ndarray:
+        """Returns the indices of the slots that contain a complete frame."""
+
+        return numpy.flatnonzero(self.metadata["valid"])
+
+    def flush(self):
+        """Flushes the memory map to disk."""
+
+        self._mmap.flush()
+
+    def close(self):
+        """Flushes the spool and releases the memory map.
+
+        The file is unmapped once all the arrays that reference it are released.
+        Calling it more than once has no effect.
+
+        """
+
+        if self.closed:
+            return
+
+        self.closed = True
+
+        if self._mmap.mode != "r":
+            self.flush()
+
+        del self.frames, self.metadata, self.header, self._mmap
+
+
+def _get_frame_header(spool: FrameSpool, index: int) -> fits.Header:
+    """Returns a header with the metadata of a spool frame."""
+
+    metadata = spool.metadata[index]
+
+    header = fits.Header()
+    header["CAMUID"] = (spool.uid, "Camera UID")
+    header["EXPTIME"] = (float(metadata["exptime"]), "Exposure time [s]")
+    header["FRAMENO"] = (int(metadata["frame_count"]), "SDK frame counter")
+    header["TIMESYS"] = ("TAI", "The time scale system")
+    header["DATE-OBS"] = (
+        Time(metadata["timestamp"], format="unix").tai.isot,
+        "Date (in TIMESYS) the frame was received",
+    )
+
+    return header
+
+
+def spool_to_fits(
+    path: PathLike,
+    output: Optional[PathLike] = None,
+    cube: bool = False,
+    overwrite: bool = False,
+) -> list[str]:
+    """Converts a spool file to FITS.
+
+    Parameters
+    ----------
+    path
+        The path to the spool file.
+    output
+        If ``cube=True``, the path of the output file, otherwise the directory where
+        the FITS files are written. Defaults to the spool path without extension, or
+        its directory.
+    cube
+        If `True`, writes all the frames to a single FITS file as a data cube, with
+        the frame metadata in a binary table extension. Otherwise writes one file
+        per frame named after the spool file and the slot index.
+    overwrite
+        Whether to overwrite existing files.
+
+    Returns
+    -------
+    files
+        A list with the paths of the FITS files written.
+
+    """
+
+    path = pathlib.Path(path)
+
+    with FrameSpool(path) as spool:
+
+        indices = spool.valid_slots()
+
+        if cube:
+            output = pathlib.Path(output or path.with_suffix(".fits"))
+            output.parent.mkdir(parents=True, exist_ok=True)
+
+            primary = fits.PrimaryHDU(data=spool.frames[indices])
+            primary.header["CAMUID"] = (spool.uid, "Camera UID")
+            primary.header["NFRAMES"] = (len(indices), "Number of frames in the cube")
+
+            metadata = spool.metadata[indices]
+            table = fits.BinTableHDU.from_columns(
+                [
+                    fits.Column("FRAMENO", "K", array=metadata["frame_count"]),
+                    fits.Column("TIMESTAMP", "D", array=metadata["timestamp"]),
+                    fits.Column("EXPTIME", "D", array=metadata["exptime"]),
+                ],
+                name="FRAMES",
+            )
+
+            fits.HDUList([primary, table]).writeto(output, overwrite=overwrite)
+
+            return [str(output)]
+
+        output = pathlib.Path(output or path.parent)
+        output.mkdir(parents=True, exist_ok=True)
+
+        files = []
+        for index in indices:
+            filename = output / f"{path.stem}-{index:04d}.fits"
+            hdu = fits.PrimaryHDU(
+                data=spool.frames[index],
+                header=_get_frame_header(spool, index),
+            )
+            hdu.writeto(filename, overwrite=overwrite)
+            files.append(str(filename))
+
+        return files
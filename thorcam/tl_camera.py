@@ -11,27 +11,31 @@ from __future__ import annotations
 import asyncio
 import ctypes
 import pathlib
+import weakref
+from contextlib import asynccontextmanager
 from ctypes import (
     POINTER,
     c_bool,
     c_char,
     c_char_p,
+    c_double,
     c_int,
     c_longlong,
     c_uint,
     c_ushort,
     c_void_p,
 )
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum
 from functools import partial
-from time import sleep
+from time import perf_counter, sleep
 
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import numpy
 
-from .exceptions import SDKError
+from . import log
+from .exceptions import AbortedError, SDKError
 
 
 CWD = pathlib.Path(__file__).parent.absolute()
@@ -48,6 +52,8 @@ SDK_FUNCTION_PROTOTYPES = {
     "close_camera": [tl_handle],
     "get_usb_port_type": [tl_handle, POINTER(c_int)],
     "get_camera_sensor_type": [tl_handle, POINTER(c_int)],
+    "get_color_filter_array_phase": [tl_handle, POINTER(c_int)],
+    "get_polar_phase": [tl_handle, POINTER(c_int)],
     "get_sensor_readout_time": [tl_handle, POINTER(c_int)],
     "get_is_armed": [tl_handle, POINTER(c_bool)],
     "get_exposure_time": [tl_handle, POINTER(c_longlong)],
@@ -57,6 +63,14 @@ SDK_FUNCTION_PROTOTYPES = {
     "disarm": [tl_handle],
     "issue_software_trigger": [tl_handle],
     "set_frames_per_trigger_zero_for_unlimited": [tl_handle, c_uint],
+    "get_frame_rate_control_value_range": [
+        tl_handle,
+        POINTER(c_double),
+        POINTER(c_double),
+    ],
+    "set_is_frame_rate_control_enabled": [tl_handle, c_int],
+    "get_frame_rate_control_value": [tl_handle, POINTER(c_double)],
+    "set_frame_rate_control_value": [tl_handle, c_double],
     "set_image_poll_timeout": [tl_handle, c_int],
     "get_pending_frame_or_null": [
         tl_handle,
@@ -71,6 +85,19 @@ SDK_FUNCTION_PROTOTYPES = {
 }
 
 
+#: Valid policies for `.SDKCamera` when frames are dropped.
+DROP_POLICIES = [None, "reduce_frame_rate", "enlarge_buffer"]
+
+#: Maximum number of frames to buffer when using the ``enlarge_buffer`` policy.
+MAX_FRAMES_TO_BUFFER = 64
+
+#: Factor by which the frame rate is reduced with the ``reduce_frame_rate`` policy.
+FRAME_RATE_REDUCTION_FACTOR = 0.8
+
+#: Size of the buffer for the space-separated serials of the discovered cameras.
+DISCOVERY_BUFFER_SIZE = 4096
+
+
 def chk_err(sdk: TL_SDK, func_name: str, err: int) -> int:
     """SDK error handling."""
 
@@ -81,30 +108,46 @@ def chk_err(sdk: TL_SDK, func_name: str, err: int) -> int:
 
 
 class TL_SDK:
-    """Thorlabs Camera SDK wrapper."""
+    """Thorlabs Camera SDK wrapper.
+
+    Parameters
+    ----------
+    libc
+        An object implementing the SDK functions to use instead of the Thorlabs
+        library, for example a `.VirtualLibc`.
 
-    def __init__(self):
+    """
+
+    def __init__(self, libc=None):
 
         self.is_sdk_open = False
 
         lib_path = "libthorlabs_tsi_camera_sdk.so"
 
-        try:
-            self.libc = ctypes.cdll.LoadLibrary(str(lib_path))
-        except OSError as err:
-            if "No such file or directory" in str(err):
-                raise OSError(
-                    f"Cannot open {lib_path}. The shared object file was not found. "
-                    "Did you copy the libthorlabs libraries to /usr/local/lib?"
-                )
-            else:
-                raise
-
-        self.load_argtypes()
+        if libc is not None:
+            self.libc = libc
+        else:
+            try:
+                self.libc = ctypes.cdll.LoadLibrary(str(lib_path))
+            except OSError as err:
+                if "No such file or directory" in str(err):
+                    raise OSError(
+                        f"Cannot open {lib_path}. The shared object file was not "
+                        "found. Did you copy the libthorlabs libraries to "
+                        "/usr/local/lib?"
+                    )
+                else:
+                    raise
+
+            self.load_argtypes()
 
         self.libc.open_sdk()
         self.is_sdk_open = True
 
+        #: The cameras currently open, by serial.
+        self.open_cameras: weakref.WeakValueDictionary[str, SDKCamera]
+        self.open_cameras = weakref.WeakValueDictionary()
+
         # We need to run this once even if we know the serial of the camera to connect.
         self._cameras: list[str] | None = None
         self.list_available_cameras()
@@ -132,39 +175,153 @@ class TL_SDK:
 
         self.libc.tl_camera_get_last_error.restype = c_char_p
 
-    def list_available_cameras(self) -> list[str]:
-        """Returns a list of connected camera identifiers."""
+    def list_available_cameras(self, refresh: bool = False) -> list[str]:
+        """Returns a list of connected camera identifiers.
+
+        If ``refresh=True``, the SDK is reopened to discover the cameras again. This
+        is only possible if no camera is open. See `.reopen`.
+
+        """
 
         # tl_camera_discover_available_cameras can only be called once after the
         # SDK opens so we cache the result.
 
-        if not self.is_sdk_open:
+        if refresh:
+            self.reopen()
+        elif not self.is_sdk_open:
             raise SDKError("SDK is not open.")
 
         if self._cameras is not None:
             return self._cameras
 
-        buffer = ctypes.create_string_buffer(100)
-        self.libc.tl_camera_discover_available_cameras(buffer, 100)
+        buffer = ctypes.create_string_buffer(DISCOVERY_BUFFER_SIZE)
+        self.libc.tl_camera_discover_available_cameras(buffer, DISCOVERY_BUFFER_SIZE)
 
         self._cameras = buffer.value.decode().split()
 
         return self._cameras
 
-    def open_camera(self, serial: str):
-        """Opens a camera and returns a `.SDKCamera` object."""
+    def reopen(self):
+        """Closes and reopens the SDK so that cameras can be discovered again.
+
+        Raises an `.SDKError` if any camera is open, since closing the SDK would
+        invalidate its handle. If the SDK is closed, for example because a previous
+        attempt to reopen it failed, it is only opened.
+
+        """
+
+        if len(self.open_cameras) > 0:
+            raise SDKError("Cannot reopen the SDK while cameras are open.")
+
+        if self.is_sdk_open:
+            self.close()
+
+        self.libc.open_sdk()
+        self.is_sdk_open = True
+
+        self._cameras = None
+
+    def open_camera(self, serial: str, **kwargs):
+        """Opens a camera and returns a `.SDKCamera` object.
+
+        Additional keyword arguments are passed to `.SDKCamera`.
+
+        """
 
         camera_serial = serial.encode() + b"\0"
         handle = c_void_p()
 
         self.libc.open_camera(camera_serial, handle)
 
-        return SDKCamera(self, handle)
+        sdk_camera = SDKCamera(self, handle, serial=serial, **kwargs)
+        self.open_cameras[serial] = sdk_camera
+
+        return sdk_camera
 
     def close(self):
         """Closes the SDK."""
 
         self.libc.close_sdk()
+        self.is_sdk_open = False
+
+
+@dataclass
+class FrameStats:
+    """Keeps track of the SDK frame counters to detect dropped frames.
+
+    The SDK numbers the frames in an acquisition sequence starting at 1 every time
+    the camera is armed. A jump in the counter means that frames were dropped, while
+    a counter that does not increase indicates a duplicated frame.
+
+    """
+
+    #: Counter of the last frame received in the current sequence.
+    last_frame: int = 0
+
+    #: Total number of frames received.
+    n_frames: int = 0
+
+    #: Total number of dropped frames.
+    dropped: int = 0
+
+    #: Total number of duplicated or out-of-order frames.
+    duplicated: int = 0
+
+    #: Number of frames dropped in the current sequence.
+    dropped_in_sequence: int = 0
+
+    #: Counters of the frames missing in the current sequence, up to ``max_gaps``.
+    gaps: list[int] = field(default_factory=list)
+
+    #: Maximum number of missing frame counters to keep in ``gaps``.
+    max_gaps: int = 100
+
+    def start_sequence(self):
+        """Resets the sequence counters. Must be called when the camera is armed."""
+
+        self.last_frame = 0
+        self.dropped_in_sequence = 0
+        self.gaps = []
+
+    def reset(self):
+        """Resets all the counters."""
+
+        self.start_sequence()
+
+        self.n_frames = 0
+        self.dropped = 0
+        self.duplicated = 0
+
+    def update(self, frame_count: int) -> list[int]:
+        """Records a new frame. Returns the counters of the frames missed, if any."""
+
+        self.n_frames += 1
+
+        if frame_count <= self.last_frame:
+            self.duplicated += 1
+            return []
+
+        missing = list(range(self.last_frame + 1, frame_count))
+        self.last_frame = frame_count
+
+        if len(missing) > 0:
+            self.dropped += len(missing)
+            self.dropped_in_sequence += len(missing)
+            self.gaps = (self.gaps + missing)[-self.max_gaps :]
+
+        return missing
+
+    def to_dict(self) -> dict:
+        """Returns the counters as a dictionary."""
+
+        return {
+            "n_frames": self.n_frames,
+            "last_frame": self.last_frame,
+            "dropped": self.dropped,
+            "duplicated": self.duplicated,
+            "dropped_in_sequence": self.dropped_in_sequence,
+            "gaps": list(self.gaps),
+        }
 
 
 @dataclass
@@ -174,8 +331,33 @@ class SDKCamera:
     sdk: TL_SDK
     handle: c_void_p
 
+    #: Number of frames the SDK buffers while the camera is armed.
+    frames_to_buffer: int = 2
+
+    #: What to do when frames are dropped. One of `.DROP_POLICIES`.
+    drop_policy: Optional[str] = None
+
+    #: The serial number of the camera.
+    serial: str = ""
+
     def __post_init__(self):
 
+        self.closed = False
+
+        if self.drop_policy not in DROP_POLICIES:
+            raise SDKError(f"Invalid drop policy {self.drop_policy!r}.")
+
+        self.frame_stats = FrameStats()
+
+        #: Serialises the acquisitions so that arming and triggering cannot interleave.
+        self.acquisition_lock = asyncio.Lock()
+
+        self._abort_event = asyncio.Event()
+        self._abort_done = asyncio.Event()
+
+        #: Increased every time a setting that is not per-exposure changes.
+        self.settings_version = 0
+
         usb_type = c_int()
         self.sdk.libc.get_usb_port_type(self.handle, usb_type)
         self.usb_type = USB_PORT_TYPE(usb_type.value)
@@ -184,6 +366,19 @@ class SDKCamera:
         self.sdk.libc.get_camera_sensor_type(self.handle, sensor_type)
         self.sensor_type = SENSOR_TYPE(sensor_type.value)
 
+        # Position of the colour or polarisation filters with respect to the
+        # top-left pixel of the image.
+        self.filter_array_phase: FILTER_ARRAY_PHASE | None = None
+        self.polar_phase: POLAR_PHASE | None = None
+
+        phase = c_int()
+        if self.sensor_type == SENSOR_TYPE.BAYER:
+            self.sdk.libc.get_color_filter_array_phase(self.handle, phase)
+            self.filter_array_phase = FILTER_ARRAY_PHASE(phase.value)
+        elif self.sensor_type == SENSOR_TYPE.MONOCHROME_POLARIZED:
+            self.sdk.libc.get_polar_phase(self.handle, phase)
+            self.polar_phase = POLAR_PHASE(phase.value)
+
         readout_time = c_int()
         self.sdk.libc.get_sensor_readout_time(self.handle, readout_time)
         self.readout_time = readout_time.value  # ns
@@ -200,10 +395,68 @@ class SDKCamera:
         self.height = height.value
         self.width = width.value
 
+        # Not all the cameras support frame rate control.
+        min_frame_rate = c_double()
+        max_frame_rate = c_double()
+        try:
+            self.sdk.libc.get_frame_rate_control_value_range(
+                self.handle,
+                min_frame_rate,
+                max_frame_rate,
+            )
+            self.frame_rate_range = (min_frame_rate.value, max_frame_rate.value)
+        except SDKError:
+            self.frame_rate_range = None
+
+        self._frame_rate: float | None = None
+
         self.sdk.libc.set_is_led_on(self.handle, 0)
 
     def __del__(self):
-        self.sdk.libc.close_camera(self.handle)
+        if not self.closed:
+            try:
+                self.close()
+            except SDKError:
+                # The handle may be stale if the SDK was reopened. There is
+                # nothing to do about it during garbage collection.
+                pass
+
+    def close(self):
+        """Closes the camera. The object cannot be used after this."""
+
+        if self.closed:
+            return
+
+        self.closed = True
+
+        if self.sdk.open_cameras.get(self.serial, None) is self:
+            del self.sdk.open_cameras[self.serial]
+
+        # Closing the SDK closes all the cameras and invalidates their handles.
+        if self.sdk.is_sdk_open:
+            self.sdk.libc.close_camera(self.handle)
+
+    def is_responsive(self) -> bool:
+        """Checks whether the camera is open and still responds to the SDK."""
+
+        if self.closed:
+            return False
+
+        try:
+            self.is_armed()
+        except SDKError:
+            return False
+
+        return True
+
+    def get_settings(self) -> dict:
+        """Returns the settings to restore if the camera is opened again."""
+
+        return {
+            "frames_to_buffer": self.frames_to_buffer,
+            "drop_policy": self.drop_policy,
+            "frame_rate": self._frame_rate,
+        }
 
     def is_armed(self):
         """Is the camera armed?"""
@@ -230,8 +483,75 @@ class SDKCamera:
         exp_time = c_longlong(int(value * 1e6))
         self.sdk.libc.set_exposure_time(self.handle, exp_time)
 
-    def _get_frame(self):
-        """Returns a frame as a Numpy array."""
+    @property
+    def frame_rate(self) -> float | None:
+        """Returns the frame rate limit (fps) or `None` if frame rate control is off."""
+
+        if self._frame_rate is None:
+            return None
+
+        frame_rate = c_double()
+        self.sdk.libc.get_frame_rate_control_value(self.handle, frame_rate)
+        return frame_rate.value
+
+    @frame_rate.setter
+    def frame_rate(self, value: float | None):
+
+        if self.frame_rate_range is None:
+            raise SDKError("This camera does not support frame rate control.")
+
+        if value is None:
+            self.sdk.libc.set_is_frame_rate_control_enabled(self.handle, 0)
+            self._frame_rate = None
+            self.settings_version += 1
+            return
+
+        if value < self.frame_rate_range[0] or value > self.frame_rate_range[1]:
+            raise SDKError("Frame rate outside of valid range.")
+
+        self.sdk.libc.set_frame_rate_control_value(self.handle, c_double(value))
+        self.sdk.libc.set_is_frame_rate_control_enabled(self.handle, 1)
+        self._frame_rate = value
+        self.settings_version += 1
+
+    def _arm(self, frames_per_trigger: int = 1):
+        """Arms the camera and starts a new frame sequence."""
+
+        if self.is_armed():
+            self.sdk.libc.disarm(self.handle)
+
+        self.sdk.libc.set_frames_per_trigger_zero_for_unlimited(
+            self.handle,
+            frames_per_trigger,
+        )
+        self.sdk.libc.arm(self.handle, self.frames_to_buffer)
+
+        self.frame_stats.start_sequence()
+
+    def _apply_drop_policy(self):
+        """Reacts to dropped frames according to ``drop_policy``."""
+
+        if self.drop_policy == "enlarge_buffer":
+            # The new buffer size is used the next time the camera is armed.
+            self.frames_to_buffer = min(2 * self.frames_to_buffer, MAX_FRAMES_TO_BUFFER)
+            self.settings_version += 1
+
+        elif self.drop_policy == "reduce_frame_rate":
+            if self.frame_rate_range is None:
+                return
+
+            frame_rate = self.frame_rate or self.frame_rate_range[1]
+            new_frame_rate = frame_rate * FRAME_RATE_REDUCTION_FACTOR
+            self.frame_rate = max(new_frame_rate, self.frame_rate_range[0])
+
+    def _get_frame(self, disarm: bool = True, copy: bool = True):
+        """Returns a frame as a Numpy array.
+
+        If ``copy=False``, the array is a view of the SDK buffer and is only valid
+        until the next frame is requested or the camera is disarmed. If
+        ``disarm=True``, the camera is disarmed after the frame has been received.
+
+        """
 
         image_buffer = POINTER(c_ushort)()
         frame_count = c_int()
@@ -248,13 +568,21 @@ class SDKCamera:
         if not image_buffer:
             return None
 
+        missing = self.frame_stats.update(frame_count.value)
+        if len(missing) > 0:
+            self._apply_drop_policy()
+
         image_buffer._wrapper = self
         image_buffer_as_array = numpy.ctypeslib.as_array(
             image_buffer,
             shape=(self.height, self.width),
         )
 
-        if self.is_armed():
+        # The SDK buffer cannot be read after the camera is disarmed.
+        if copy:
+            image_buffer_as_array = image_buffer_as_array.copy()
+
+        if disarm and self.is_armed():
             self.sdk.libc.disarm(self.handle)
 
         return image_buffer_as_array
@@ -265,8 +593,7 @@ class SDKCamera:
         if exposure_time is not None:
             self.exposure_time = exposure_time
 
-        if self.is_armed():
-            self.sdk.libc.arm(self.handle, 2)
+        self._arm()
 
         self.sdk.libc.set_image_poll_timeout(self.handle, 100)
         self.sdk.libc.issue_software_trigger(self.handle)
@@ -275,25 +602,179 @@ class SDKCamera:
 
         return self._get_frame()
 
+    def _drain_frames(self) -> int:
+        """Discards the frames pending in the SDK buffer. Returns how many."""
+
+        self.sdk.libc.set_image_poll_timeout(self.handle, 1)
+
+        n_drained = 0
+        while n_drained <= self.frames_to_buffer:
+            image_buffer = POINTER(c_ushort)()
+            self.sdk.libc.get_pending_frame_or_null(
+                self.handle,
+                image_buffer,
+                c_int(),
+                POINTER(c_char)(),
+                c_int(),
+            )
+            if not image_buffer:
+                break
+            n_drained += 1
+
+        return n_drained
+
+    def _stop_acquisition(self):
+        """Disarms the camera and drains any pending frames."""
+
+        if self.is_armed():
+            self.sdk.libc.disarm(self.handle)
+
+        self._drain_frames()
+
+    def _stop_acquisition_quietly(self):
+        """Stops the acquisition, logging SDK errors instead of raising them.
+
+        Used while an exception is being raised, which the SDK error would replace.
+        The camera may be gone, for example after a USB glitch.
+
+        """
+
+        try:
+            self._stop_acquisition()
+        except SDKError as err:
+            log.warning(f"Camera {self.serial}: failed to stop acquisition: {err}")
+
+    @asynccontextmanager
+    async def _acquisition(self):
+        """Holds the acquisition lock and stops the acquisition on cancellation."""
+
+        async with self.acquisition_lock:
+            self._abort_event.clear()
+
+            try:
+                yield
+            except asyncio.CancelledError:
+                self._stop_acquisition_quietly()
+                raise
+            finally:
+                self._abort_done.set()
+
+    def _check_aborted(self):
+        """Stops the acquisition and raises `.AbortedError` if it was aborted."""
+
+        if self._abort_event.is_set():
+            self._stop_acquisition_quietly()
+            raise AbortedError("Exposure aborted.")
+
+    async def _wait_exposure(self, delay: float):
+        """Waits for an exposure to complete, returning early if it is aborted."""
+
+        try:
+            await asyncio.wait_for(self._abort_event.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+        self._check_aborted()
+
+    async def abort(self, timeout: float = 5.0) -> float:
+        """Aborts the ongoing acquisition, if any.
+
+        The camera is disarmed and the pending frames are discarded. Returns the
+        abort latency, in seconds, measured from the moment ``abort`` is called
+        until the acquisition has been stopped.
+
+        """
+
+        start = perf_counter()
+
+        if not self.acquisition_lock.locked():
+            self._stop_acquisition()
+            return perf_counter() - start
+
+        self._abort_done.clear()
+        self._abort_event.set()
+
+        await asyncio.wait_for(self._abort_done.wait(), timeout)
+
+        return perf_counter() - start
+
     async def expose_async(
         self,
         exposure_time: Optional[float] = None,
     ) -> numpy.ndarray | None:
-        """Expose and return a Numpy array. Blocks synchronously."""
+        """Expose and return a Numpy array.
 
-        if self.is_armed():
-            self.sdk.libc.disarm(self.handle)
+        Only one acquisition can run at a time; others wait for the acquisition lock.
+        Raises `.AbortedError` if the exposure is aborted with `.abort`.
 
-        if exposure_time is not None:
-            self.exposure_time = exposure_time
+        """
 
-        self.sdk.libc.set_image_poll_timeout(self.handle, 100)
-        self.sdk.libc.arm(self.handle, 1)
-        self.sdk.libc.issue_software_trigger(self.handle)
+        async with self._acquisition():
 
-        await asyncio.sleep(self.exposure_time)
+            if exposure_time is not None:
+                self.exposure_time = exposure_time
 
-        return self._get_frame()
+            self.sdk.libc.set_image_poll_timeout(self.handle, 100)
+            self._arm()
+            self.sdk.libc.issue_software_trigger(self.handle)
+
+            await self._wait_exposure(self.exposure_time)
+
+            return self._get_frame()
+
+    async def expose_sequence_async(
+        self,
+        n_frames: int,
+        exposure_time: Optional[float] = None,
+        timeout: float = 5.0,
+        copy: bool = True,
+    ) -> AsyncIterator[tuple[int, numpy.ndarray]]:
+        """Acquires a sequence of frames with a single trigger.
+
+        Yields a tuple with the SDK frame counter and the frame. Dropped frames are
+        not yielded but are recorded in ``frame_stats``. Raises an `.SDKError` if no
+        frame is received for ``timeout`` seconds, or `.AbortedError` if the sequence
+        is aborted. If ``copy=False``, the yielded array is a view of the SDK buffer
+        which is only valid until the next frame.
+
+        """
+
+        async with self._acquisition():
+
+            if exposure_time is not None:
+                self.exposure_time = exposure_time
+
+            # Poll without blocking so that we can yield to the event loop.
+            self.sdk.libc.set_image_poll_timeout(self.handle, 1)
+            self._arm(n_frames)
+            self.sdk.libc.issue_software_trigger(self.handle)
+
+            loop = asyncio.get_running_loop()
+            last_frame_time = loop.time()
+            max_wait = self.exposure_time + timeout
+
+            try:
+                while self.frame_stats.last_frame < n_frames:
+                    self._check_aborted()
+
+                    frame = self._get_frame(disarm=False, copy=copy)
+
+                    if frame is None:
+                        if loop.time() - last_frame_time > max_wait:
+                            raise SDKError("Timed out waiting for frames.")
+                        await asyncio.sleep(0.001)
+                        continue
+
+                    last_frame_time = loop.time()
+                    yield self.frame_stats.last_frame, frame
+
+            finally:
+                try:
+                    if self.is_armed():
+                        self.sdk.libc.disarm(self.handle)
+                except SDKError as err:
+                    # Do not replace the exception that ended the sequence.
+                    log.warning(f"Camera {self.serial}: failed to disarm: {err}")
 
 
 class OPERATION_MODE(IntEnum):
@@ -384,3 +865,21 @@ class COMMUNICATION_INTERFACE(IntEnum):
     GIG_E = 0  # The camera uses the GigE Vision (GigE) interface standard.
     LINK = 1  # The camera uses the CameraLink serial-communication-protocol standard.
     USB = 2  # The camera uses a USB interface.
+
+
+class FILTER_ARRAY_PHASE(IntEnum):
+    """The colour of the top-left pixel of a Bayer sensor."""
+
+    BAYER_RED = 0  # A red pixel, followed by green on the same row (RGGB).
+    BAYER_BLUE = 1  # A blue pixel, followed by green on the same row (BGGR).
+    GREEN_LEFT_OF_RED = 2  # A green pixel, followed by red on the same row (GRBG).
+    GREEN_LEFT_OF_BLUE = 3  # A green pixel, followed by blue on the same row (GBRG).
+
+
+class POLAR_PHASE(IntEnum):
+    """The polarisation angle of the top-left pixel of a polarised sensor."""
+
+    PHASE_0 = 0  # 0 degrees.
+    PHASE_45 = 1  # 45 degrees.
+    PHASE_90 = 2  # 90 degrees.
+    PHASE_135 = 3  # 135 degrees.